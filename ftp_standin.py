@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Server FTP(S) + HTTP extractor pengganti (stand-in) untuk test dan benchmark lokal.
+
+Semua file disimpan di memori. Server FTP mendukung perintah yang dipakai smart_deploy
+(login, AUTH TLS, PASV, STOR, DELE, MKD, SIZE, XMD5/XCRC, MLSD, ...) dan bisa diatur
+untuk mensimulasikan server bermasalah (STOR ditolak, upload terpotong, koneksi putus).
+Server HTTP menjalankan kontrak yang sama dengan BUNDLE_EXTRACTOR_PHP.
+"""
+
+import hashlib
+import io
+import json
+import posixpath
+import re
+import socket
+import socketserver
+import ssl
+import threading
+import time
+import zipfile
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# ================= FTP(S) STAND-IN =================
+
+class StandinFTPServer:
+    """
+    Server FTP minimal di memori. Jalankan dengan `with StandinFTPServer() as srv:` lalu
+    arahkan FTP_HOST / FTP_PORT ke srv.host / srv.port. Berikan certfile + keyfile untuk FTPS.
+    """
+    def __init__(self, host="127.0.0.1", user="test", password="test", certfile=None, keyfile=None,
+                 require_session_reuse=False):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.require_session_reuse = require_session_reuse
+        self.ssl_context = None
+        if certfile:
+            self.ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+            self.ssl_context.load_cert_chain(certfile, keyfile)
+
+        self.files = {}
+        self.dirs = set()
+        self.commands = []
+        self.features = ["SIZE", "MLST type*;size*;"]
+        self.replies = {}            # perintah -> balasan tetap, mis. {"SIZE": "213 n/a"}
+        # Simulasi server bermasalah
+        self.reject_stor = None      # callable(path) -> True untuk menolak STOR (553)
+        self.corrupt = {}            # path -> "truncate" / "flip", berlaku sekali
+        self.drop_on_mkd = 0         # N perintah MKD pertama memutus koneksi kontrol
+        self.stor_delay = 0          # detik jeda sebelum balasan 226 (simulasi server lambat)
+        self.stor_stall = 0          # detik jeda sebelum data STOR mulai dibaca (klien kena timeout)
+        self.max_connections = 0     # > 0: koneksi kontrol berikutnya ditolak dengan 421
+        self.active_connections = 0
+        self.data_sessions_reused = []
+        self.lock = threading.Lock()
+        self._server = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def start(self):
+        standin = self
+
+        class Handler(socketserver.BaseRequestHandler):
+            def handle(self):
+                _FTPSession(standin, self.request).serve()
+
+        self._server = socketserver.ThreadingTCPServer((self.host, 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self): return self.start()
+    def __exit__(self, *exc): self.stop()
+
+    @staticmethod
+    def normalize(path):
+        return posixpath.normpath("/" + path).lstrip("/")
+
+class _FTPSession:
+    def __init__(self, standin, sock):
+        self.standin = standin
+        # Balasan kontrol kecil & beruntun (150 lalu 226): tanpa NODELAY kena stall delayed-ACK ~40 ms
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock = sock
+        self.rfile = sock.makefile("rb")
+        self.tls = False
+        self.prot_p = False
+        self.logged_in = False
+        self.user = None
+        self.pasv = None
+
+    def send(self, line):
+        self.sock.sendall((line + "\r\n").encode("utf-8"))
+
+    def serve(self):
+        standin = self.standin
+        with standin.lock:
+            full = 0 < standin.max_connections <= standin.active_connections
+            if not full: standin.active_connections += 1
+        if full:
+            try: self.send("421 Too many connections")
+            finally: self.sock.close()
+            return
+        try:
+            self.send("220 smart-deploy stand-in")
+            while True:
+                raw = self.rfile.readline()
+                if not raw: break
+                line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+                cmd, _, arg = line.partition(" ")
+                cmd = cmd.upper()
+                with self.standin.lock: self.standin.commands.append(cmd)
+                handler = getattr(self, f"cmd_{cmd}", None)
+                if cmd in self.standin.replies and self.logged_in:
+                    self.send(self.standin.replies[cmd])
+                elif handler is None:
+                    self.send("502 Command not implemented")
+                elif cmd not in ("USER", "PASS", "AUTH", "QUIT", "FEAT") and not self.logged_in:
+                    self.send("530 Not logged in")
+                elif handler(arg) is False:
+                    break
+        except (OSError, ssl.SSLError):
+            pass
+        finally:
+            with standin.lock: standin.active_connections -= 1
+            if self.pasv: self.pasv.close()
+            try: self.sock.close()
+            except OSError: pass
+
+    # ---------- kontrol ----------
+
+    def cmd_AUTH(self, arg):
+        if not self.standin.ssl_context or arg.upper() not in ("TLS", "SSL"):
+            return self.send("504 AUTH not supported")
+        self.send("234 AUTH TLS OK")
+        self.sock = self.standin.ssl_context.wrap_socket(self.sock, server_side=True)
+        self.rfile = self.sock.makefile("rb")
+        self.tls = True
+
+    def cmd_USER(self, arg):
+        self.user = arg
+        self.send("331 Password required")
+
+    def cmd_PASS(self, arg):
+        if self.user == self.standin.user and arg == self.standin.password:
+            self.logged_in = True
+            return self.send("230 Logged in")
+        self.send("530 Login incorrect")
+
+    def cmd_PBSZ(self, arg): self.send("200 PBSZ=0")
+
+    def cmd_PROT(self, arg):
+        self.prot_p = arg.upper() == "P"
+        self.send("200 PROT OK")
+
+    def cmd_FEAT(self, arg):
+        self.send("211-Features:")
+        for feature in self.standin.features: self.send(" " + feature)
+        self.send("211 End")
+
+    def cmd_OPTS(self, arg): self.send("200 OK")
+    def cmd_TYPE(self, arg): self.send("200 Type set")
+    def cmd_NOOP(self, arg): self.send("200 NOOP ok")
+    def cmd_CWD(self, arg): self.send("250 CWD ok")
+    def cmd_PWD(self, arg): self.send('257 "/"')
+    def cmd_SYST(self, arg): self.send("215 UNIX Type: L8")
+
+    def cmd_QUIT(self, arg):
+        self.send("221 Bye")
+        return False
+
+    def cmd_MKD(self, arg):
+        standin = self.standin
+        with standin.lock:
+            drop = standin.drop_on_mkd > 0
+            if drop: standin.drop_on_mkd -= 1
+            else: standin.dirs.add(standin.normalize(arg))
+        if drop: return False
+        self.send(f'257 "{arg}" created')
+
+    def cmd_DELE(self, arg):
+        with self.standin.lock:
+            existed = self.standin.files.pop(self.standin.normalize(arg), None) is not None
+        self.send("250 Deleted" if existed else "550 No such file")
+
+    def cmd_SIZE(self, arg):
+        data = self.standin.files.get(self.standin.normalize(arg))
+        self.send(f"213 {len(data)}" if data is not None else "550 No such file")
+
+    def cmd_XMD5(self, arg):
+        if "XMD5" not in self.standin.features: return self.send("502 Command not implemented")
+        data = self.standin.files.get(self.standin.normalize(arg))
+        if data is None: return self.send("550 No such file")
+        self.send(f"250 {hashlib.md5(data).hexdigest().upper()}")
+
+    def cmd_XCRC(self, arg):
+        if "XCRC" not in self.standin.features: return self.send("502 Command not implemented")
+        data = self.standin.files.get(self.standin.normalize(arg))
+        if data is None: return self.send("550 No such file")
+        self.send(f"250 {zlib.crc32(data):08X}")
+
+    # ---------- data ----------
+
+    def cmd_PASV(self, arg):
+        if self.pasv: self.pasv.close()
+        self.pasv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.pasv.bind((self.standin.host, 0))
+        self.pasv.listen(1)
+        self.pasv.settimeout(10)
+        host, port = self.pasv.getsockname()
+        self.send(f"227 Entering Passive Mode ({host.replace('.', ',')},{port >> 8},{port & 255})")
+
+    def _accept_data(self):
+        listener, self.pasv = self.pasv, None
+        if listener is None: return None
+        try:
+            conn, _ = listener.accept()
+        finally:
+            listener.close()
+        return conn
+
+    def _secure_data(self, conn):
+        if not (self.tls and self.prot_p): return conn
+        conn = self.standin.ssl_context.wrap_socket(conn, server_side=True)
+        with self.standin.lock: self.standin.data_sessions_reused.append(conn.session_reused)
+        if self.standin.require_session_reuse and not conn.session_reused:
+            conn.close()
+            raise ssl.SSLError("session reuse required")
+        return conn
+
+    @staticmethod
+    def _close_data(conn):
+        if isinstance(conn, ssl.SSLSocket):
+            try: conn.unwrap()
+            except (OSError, ssl.SSLError): pass
+        conn.close()
+
+    def cmd_STOR(self, arg):
+        path = self.standin.normalize(arg)
+        conn = self._accept_data()
+        if conn is None: return self.send("425 Use PASV first")
+        if self.standin.reject_stor and self.standin.reject_stor(path):
+            conn.close()
+            return self.send("553 Could not create file")
+        self.send("150 Ok to send data")
+        try:
+            conn = self._secure_data(conn)
+        except ssl.SSLError:
+            return self.send("522 SSL connection failed: session reuse required")
+        if self.standin.stor_stall: time.sleep(self.standin.stor_stall)
+        chunks = []
+        while True:
+            try: chunk = conn.recv(65536)
+            except OSError: break  # klien menutup koneksi data di tengah transfer
+            if not chunk: break
+            chunks.append(chunk)
+        self._close_data(conn)
+        data = b"".join(chunks)
+        with self.standin.lock:
+            mode = self.standin.corrupt.pop(path, None)
+            if mode == "truncate": data = data[:len(data) // 2]
+            elif mode == "flip" and data: data = bytes([data[0] ^ 1]) + data[1:]
+            self.standin.files[path] = data
+        if self.standin.stor_delay: time.sleep(self.standin.stor_delay)
+        self.send("226 Transfer complete")
+
+    def cmd_MLSD(self, arg):
+        base = self.standin.normalize(arg or "/")
+        prefix = base + "/" if base and base != "." else ""
+        names = {}
+        with self.standin.lock:
+            for path, data in self.standin.files.items():
+                if path.startswith(prefix) and "/" not in path[len(prefix):]:
+                    names[path[len(prefix):]] = f"type=file;size={len(data)};"
+            for d in self.standin.dirs:
+                if d.startswith(prefix) and d != base and "/" not in d[len(prefix):]:
+                    names[d[len(prefix):]] = "type=dir;"
+        conn = self._accept_data()
+        if conn is None: return self.send("425 Use PASV first")
+        self.send("150 Here comes the listing")
+        conn = self._secure_data(conn)
+        conn.sendall("".join(f"{facts} {name}\r\n" for name, facts in sorted(names.items())).encode("utf-8"))
+        self._close_data(conn)
+        self.send("226 Directory send OK")
+
+# ================= HTTP EXTRACTOR STAND-IN =================
+
+class StandinExtractorServer:
+    """
+    Pengganti HTTP untuk extractor PHP: GET /<script>?token=... membaca script dan arsip dari
+    StandinFTPServer, mengekstrak arsip ke folder script, menghapus keduanya dan membalas JSON.
+    Set `available = False` untuk mensimulasikan extractor yang tidak bisa dipanggil.
+    """
+    TOKEN_RE = re.compile(r"\$token = '([^']*)'")
+    ARCHIVE_RE = re.compile(r"__DIR__ \. '/([^']+)'")
+
+    def __init__(self, ftp_server, host="127.0.0.1"):
+        self.ftp = ftp_server
+        self.host = host
+        self.available = True
+        self.requests = []
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self._server.server_address[1]}/"
+
+    def start(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                status, payload = standin.handle(self.path)
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args): pass
+
+        self._server = ThreadingHTTPServer((self.host, 0), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self): return self.start()
+    def __exit__(self, *exc): self.stop()
+
+    def handle(self, raw_path):
+        parts = urlsplit(raw_path)
+        script_path = StandinFTPServer.normalize(parts.path)
+        self.requests.append(script_path)
+        if not self.available: return 503, {"ok": False, "error": "unavailable"}
+
+        files = self.ftp.files
+        script = files.get(script_path)
+        if script is None: return 404, {"ok": False, "error": "not found"}
+        script = script.decode("utf-8")
+        token = self.TOKEN_RE.search(script).group(1)
+        if parse_qs(parts.query).get("token", [""])[0] != token:
+            return 403, {"ok": False, "error": "bad token"}
+
+        base = posixpath.dirname(script_path)
+        archive_path = StandinFTPServer.normalize(posixpath.join(base, self.ARCHIVE_RE.search(script).group(1)))
+        with self.ftp.lock:
+            archive = files.pop(archive_path, None)
+            files.pop(script_path, None)
+            if archive is None: return 500, {"ok": False, "error": "cannot open archive"}
+            with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+                for name in zf.namelist():
+                    files[StandinFTPServer.normalize(posixpath.join(base, name))] = zf.read(name)
+                count = len(zf.namelist())
+        return 200, {"ok": True, "files": count}
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import argparse
+import asyncio
+import concurrent.futures
 import ftplib
+import hashlib
+import io
 import os
 import sys
 import time
@@ -13,23 +18,74 @@ from pathlib import Path
 from queue import Queue
 import json
 import stat
+import secrets
+import socket
+import ssl
+import tempfile
+import urllib.request
+import zipfile
+import zlib
 
 # ================= CONFIGURATION & CONSTANTS =================
 
 CONFIG_FILENAME = "deploy_config.json"
+STATS_FILENAME = "deploy_stats.json"
 
 DEFAULT_CONFIG = {
     "FTP_HOST": "",
     "FTP_USER": "",
     "FTP_PASS": "",
+    "FTP_PORT": 21,
     "LOCAL_DIR": ".",
     "REMOTE_DIR": "/",
     "EXCLUDE_PATTERNS": [
-        "*.git*", ".env", "node_modules", "vendor", ".idea", ".vscode", "deploy_config.json"
+        "*.git*", ".env", "node_modules", "vendor", ".idea", ".vscode", "deploy_config.json", "deploy_stats.json"
     ],
-    "PATH_MAPPINGS": [] 
+    "PATH_MAPPINGS": [],
+    # URL publik yang menunjuk ke REMOTE_DIR. Kosong = bundle mode nonaktif.
+    "BUNDLE_EXTRACT_URL": "",
+    "BUNDLE_MIN_FILES": 20,
+    # "ftplib" (blocking, satu koneksi) atau "asyncio" (banyak transfer paralel dari satu thread)
+    "FTP_ENGINE": "ftplib",
+    "FTP_CONNECTIONS": 4,
+    # Explicit FTPS (AUTH TLS). Sesi TLS kontrol dipakai ulang di setiap koneksi data.
+    "FTP_TLS": False,
+    "FTP_TLS_VERIFY": True,
+    # Cek SIZE / HASH remote setelah upload (paralel dengan upload), file yang tidak cocok diupload ulang
+    "VERIFY_UPLOADS": True,
+    "VERIFY_RETRIES": 2,
+    # Watch mode: branch kosong = branch yang sedang di-checkout (HEAD)
+    "WATCH_BRANCH": "",
+    "WATCH_DEBOUNCE": 5,
+    "WATCH_INTERVAL": 1
 }
 
+# Extractor sekali pakai: diupload bersama arsip, dipanggil lewat HTTP, lalu menghapus dirinya sendiri.
+BUNDLE_EXTRACTOR_PHP = r"""<?php
+header('Content-Type: application/json');
+$token = '__TOKEN__';
+if (!isset($_GET['token']) || !hash_equals($token, (string)$_GET['token'])) {
+    http_response_code(403);
+    echo json_encode(['ok' => false, 'error' => 'bad token']);
+    exit;
+}
+$archive = __DIR__ . '/__ARCHIVE__';
+$zip = new ZipArchive();
+if ($zip->open($archive) !== true) {
+    @unlink($archive);
+    @unlink(__FILE__);
+    http_response_code(500);
+    echo json_encode(['ok' => false, 'error' => 'cannot open archive']);
+    exit;
+}
+$ok = $zip->extractTo(__DIR__);
+$count = $zip->numFiles;
+$zip->close();
+@unlink($archive);
+@unlink(__FILE__);
+echo json_encode(['ok' => $ok, 'files' => $count]);
+"""
+
 # ================= UI COLORS 2026 =================
 
 CLR_BG = "#0D1117"        # Dark Deep Space
@@ -46,6 +102,8 @@ CLR_QUICK = "#F2A742"     # Gold/Orange for Quick Deploy
 # ================= UTILS & LOGIC =================
 
 log_queue = Queue()
+# Satu deployment dalam satu waktu (tombol GUI, Quick Deploy dan watch mode)
+deploy_lock = threading.Lock()
 
 def load_config():
     script_dir = Path(__file__).parent.resolve()
@@ -101,6 +159,341 @@ def resolve_remote_path(local_rel_path, mappings):
             return Path(final_path).as_posix()
     return posix_path
 
+def remote_parent_dirs(remote_file_path):
+    """Daftar folder induk (dari yang terluar) yang harus ada sebelum file di-STOR."""
+    parent_dir = Path(remote_file_path).parent.as_posix()
+    if parent_dir in [".", "/", ""]: return []
+    dirs = []
+    current = ""
+    for part in parent_dir.split('/'):
+        if not part: continue
+        current += "/" + part
+        dirs.append(current)
+    return dirs
+
+# ================= FTP / FTPS CONNECTIONS =================
+
+def make_ftps_context(config, context_class=ssl.SSLContext):
+    ctx = context_class(ssl.PROTOCOL_TLS_CLIENT)
+    if config.get("FTP_TLS_VERIFY", True):
+        ctx.load_default_certs()
+    else:
+        # Shared hosting sering memakai sertifikat self-signed / hostname tidak cocok
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    return ctx
+
+class ReusedSessionFTP_TLS(ftplib.FTP_TLS):
+    """FTP_TLS yang memakai ulang sesi TLS koneksi kontrol untuk setiap koneksi data."""
+    reuse_session = True
+
+    def ntransfercmd(self, cmd, rest=None):
+        conn, size = ftplib.FTP.ntransfercmd(self, cmd, rest)
+        # Tanpa TCP_NODELAY, record TLS kecil (handshake, close_notify) tertahan delayed-ACK ~40ms per file
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if self._prot_p:
+            session = self.sock.session if self.reuse_session else None
+            conn = self.context.wrap_socket(conn, server_hostname=self.host, session=session)
+        return conn, size
+
+def open_ftp(config, timeout=30, reuse_session=True):
+    """Buka koneksi FTP/FTPS yang sudah login, PROT P (jika TLS) dan passive mode."""
+    if config.get("FTP_TLS"):
+        ftp = ReusedSessionFTP_TLS(context=make_ftps_context(config), timeout=timeout)
+        ftp.reuse_session = reuse_session
+    else:
+        ftp = ftplib.FTP(timeout=timeout)
+    try:
+        ftp.connect(config["FTP_HOST"], int(config.get("FTP_PORT") or 21))
+        ftp.login(config["FTP_USER"], config["FTP_PASS"])
+        if config.get("FTP_TLS"): ftp.prot_p()
+        ftp.set_pasv(True)
+    except:
+        ftp.close()
+        raise
+    return ftp
+
+class FTPConnectionPool:
+    """
+    Pool koneksi kontrol yang berumur panjang. Koneksi dikembalikan ke pool setelah deploy
+    sehingga deploy berikutnya tidak perlu login / handshake TLS lagi.
+    """
+    def __init__(self, config, max_idle=8, idle_timeout=240):
+        self.config = dict(config)
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout=30):
+        while True:
+            with self._lock:
+                if not self._idle: break
+                ftp, last_used = self._idle.pop()
+            if time.time() - last_used < self.idle_timeout:
+                try:
+                    ftp.voidcmd("NOOP")
+                    return ftp
+                except: pass
+            self._close(ftp)
+        return open_ftp(self.config, timeout=timeout)
+
+    def release(self, ftp, broken=False):
+        if not broken:
+            with self._lock:
+                if len(self._idle) < self.max_idle:
+                    self._idle.append((ftp, time.time()))
+                    return
+        self._close(ftp)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for ftp, _ in idle: self._close(ftp)
+
+    @staticmethod
+    def _close(ftp):
+        try: ftp.quit()
+        except:
+            try: ftp.close()
+            except: pass
+
+# Urutan preferensi algoritma untuk perintah HASH, beserta panjang hex digest-nya
+HASH_ALGORITHMS = {"SHA-256": 64, "SHA-1": 40, "MD5": 32}
+
+def detect_hash_command(ftp):
+    """
+    Baca FEAT dan pilih perintah hash server: HASH (draft-bryan-ftp-hash), XMD5 atau XCRC.
+    Return (perintah, algoritma) atau None jika server tidak mendukung.
+    """
+    try: feat = ftp.sendcmd('FEAT')
+    except: return None
+    features = {}
+    for line in feat.splitlines()[1:-1]:
+        name, _, params = line.strip().partition(' ')
+        features[name.upper()] = params.strip()
+    if 'HASH' in features:
+        offered = [a.strip().upper() for a in features['HASH'].split(';') if a.strip()]
+        current = next((a.rstrip('*') for a in offered if a.endswith('*')), None)
+        offered = [a.rstrip('*') for a in offered]
+        for algo in HASH_ALGORITHMS:
+            if algo not in offered: continue
+            if algo == current: return ('HASH', algo)
+            try:
+                ftp.voidcmd(f'OPTS HASH {algo}')
+                return ('HASH', algo)
+            except: pass
+        if current in HASH_ALGORITHMS: return ('HASH', current)
+    if 'XMD5' in features: return ('XMD5', 'MD5')
+    if 'XCRC' in features: return ('XCRC', 'CRC32')
+    return None
+
+def local_file_hash(path, algo):
+    """Hash file lokal sebagai integer (agar hex dengan/tanpa leading zero tetap sama)."""
+    if algo == 'CRC32':
+        crc = 0
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''): crc = zlib.crc32(chunk, crc)
+        return crc
+    h = hashlib.new(algo.replace('-', '').lower())
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''): h.update(chunk)
+    return int(h.hexdigest(), 16)
+
+def parse_hash_reply(resp, algo):
+    """Ambil digest dari balasan HASH/XMD5/XCRC (format server berbeda-beda)."""
+    length = HASH_ALGORITHMS.get(algo, 8)
+    tokens = [t for t in resp[4:].split() if len(t) == length and all(c in '0123456789abcdefABCDEF' for c in t)]
+    if not tokens: return None
+    # Nama file di balasan XCRC bisa saja berupa hex ("250 cafe 1A2B3C4D"): CRC selalu token terakhir
+    return int(tokens[-1 if algo == 'CRC32' else 0], 16)
+
+class UploadVerifier:
+    """
+    Thread verifikasi yang berjalan bersamaan dengan worker upload. Setiap file yang selesai
+    di-STOR disubmit ke sini, dicek SIZE lalu hash server (jika ada di FEAT) memakai koneksi
+    sendiri dari pool. drain() menunggu semua cek selesai dan mengembalikan file yang tidak cocok;
+    file yang tidak bisa dicek sama sekali (error koneksi / balasan aneh) dicatat di unverified().
+    """
+    def __init__(self, deployer):
+        self.deployer = deployer
+        self.hash_cmd = None
+        self._queue = Queue()
+        self._cond = threading.Condition()
+        self._outstanding = 0
+        self._mismatched = []
+        self._unverified = set()
+        self._local_hashes = {}
+        self._stopped = False
+        self._ftp = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _log(self, message): log_queue.put(message)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, local_rel_path):
+        with self._cond: self._outstanding += 1
+        self._queue.put(local_rel_path)
+
+    def report_failed(self, local_rel_path):
+        """STOR gagal: dihitung tidak cocok agar ikut putaran upload ulang."""
+        with self._cond:
+            self._mismatched.append(local_rel_path)
+            self._cond.notify_all()
+
+    def unverified(self):
+        with self._cond: return sorted(self._unverified)
+
+    def drain(self):
+        with self._cond:
+            self._cond.wait_for(lambda: self._outstanding == 0 or self._stopped)
+            mismatched, self._mismatched = self._mismatched, []
+        return mismatched
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        self._queue.put(None)
+
+    def _connect(self):
+        ftp = self.deployer.pool.acquire()
+        try: ftp.cwd(self.deployer.remote_dir_base)
+        except: pass
+        ftp.voidcmd('TYPE I')
+        if self.hash_cmd is None:
+            self.hash_cmd = detect_hash_command(ftp) or False
+            if self.hash_cmd: self._log(f"🔎 Verifikasi: SIZE + {self.hash_cmd[0]} ({self.hash_cmd[1]})")
+            else: self._log("🔎 Verifikasi: SIZE (server tidak mendukung HASH/XMD5/XCRC)")
+        return ftp
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None: break
+            ok = None
+            try:
+                if self._ftp is None: self._ftp = self._connect()
+                ok = self._check(self._ftp, item)
+            except Exception as e:
+                self._log(f"⚠️ VERIFY: {item} tidak bisa diverifikasi ({e})")
+                if self._ftp is not None:
+                    self.deployer.pool.release(self._ftp, broken=True)
+                    self._ftp = None
+            with self._cond:
+                if ok is False: self._mismatched.append(item)
+                if ok is None: self._unverified.add(item)
+                else: self._unverified.discard(item)
+                self._outstanding -= 1
+                self._cond.notify_all()
+        if self._ftp is not None:
+            self.deployer.pool.release(self._ftp)
+            self._ftp = None
+
+    def _local_hash(self, local_rel_path):
+        # Dihitung sekali per file, dipakai ulang saat file diupload ulang
+        if local_rel_path not in self._local_hashes:
+            self._local_hashes[local_rel_path] = local_file_hash(self.deployer.local_dir / local_rel_path, self.hash_cmd[1])
+        return self._local_hashes[local_rel_path]
+
+    def _check(self, ftp, local_rel_path):
+        """Return True (cocok), False (harus diupload ulang) atau None (tidak bisa diverifikasi)."""
+        remote = resolve_remote_path(local_rel_path, self.deployer.mappings)
+        local_size = os.path.getsize(self.deployer.local_dir / local_rel_path)
+        try:
+            remote_size = ftp.size(remote)
+        except ftplib.error_perm as e:
+            if str(e)[:3] == '550':
+                self._log(f"⚠️ VERIFY: {remote} tidak ditemukan di server")
+                return False
+            remote_size = None  # SIZE tidak didukung
+        if remote_size is not None and remote_size != local_size:
+            self._log(f"⚠️ VERIFY: {remote} terpotong ({remote_size} != {local_size} byte)")
+            return False
+        if self.hash_cmd:
+            command, algo = self.hash_cmd
+            try: remote_hash = parse_hash_reply(ftp.sendcmd(f'{command} {remote}'), algo)
+            except ftplib.error_perm: remote_hash = None
+            # Server mengumumkan hash tapi balasannya ditolak / tidak bisa dibaca: belum terverifikasi
+            if remote_hash is None: return None
+            if remote_hash != self._local_hash(local_rel_path):
+                self._log(f"⚠️ VERIFY: {remote} checksum {algo} tidak cocok")
+                return False
+        elif remote_size is None:
+            return None  # tidak ada SIZE maupun hash: tidak ada yang dicek
+        return True
+
+_ftp_pools = {}
+_ftp_pools_lock = threading.Lock()
+
+def _pool_key(config):
+    return (config["FTP_HOST"], int(config.get("FTP_PORT") or 21), config["FTP_USER"], config["FTP_PASS"],
+            bool(config.get("FTP_TLS")), bool(config.get("FTP_TLS_VERIFY", True)))
+
+def get_ftp_pool(config):
+    key = _pool_key(config)
+    with _ftp_pools_lock:
+        if key not in _ftp_pools: _ftp_pools[key] = FTPConnectionPool(config)
+        return _ftp_pools[key]
+
+def start_benchmark_server(certfile=None, keyfile=None):
+    """
+    Jalankan server FTPS pengganti (ftp_standin.py) di 127.0.0.1 untuk benchmark_ftps.
+    Tanpa certfile, sertifikat self-signed sementara dibuat dengan openssl.
+    Return (server, config); panggil server.stop() setelah selesai.
+    """
+    from ftp_standin import StandinFTPServer
+    with tempfile.TemporaryDirectory(prefix="ftps_bench_") as tmpdir:
+        if not certfile:
+            certfile, keyfile = os.path.join(tmpdir, "cert.pem"), os.path.join(tmpdir, "key.pem")
+            subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                            '-subj', '/CN=localhost', '-keyout', keyfile, '-out', certfile],
+                           check=True, capture_output=True)
+        # Sertifikat sudah dimuat ke SSLContext di sini, file sementara boleh dihapus
+        server = StandinFTPServer(certfile=certfile, keyfile=keyfile).start()
+    config = dict(DEFAULT_CONFIG, FTP_HOST=server.host, FTP_PORT=server.port, FTP_USER=server.user,
+                  FTP_PASS=server.password, REMOTE_DIR="/", FTP_TLS_VERIFY=False)
+    return server, config
+
+def benchmark_ftps(config, files=30, size=1024):
+    """
+    Bandingkan overhead per file: FTP biasa, FTPS naif (handshake TLS penuh di tiap koneksi data)
+    dan FTPS dengan session reuse. config harus menunjuk ke server test (lihat start_benchmark_server),
+    bukan deploy_config.json: benchmark meng-upload dan menghapus file .ftps_bench_* di REMOTE_DIR.
+    """
+    modes = [
+        ("plain FTP", dict(config, FTP_TLS=False), True),
+        ("FTPS naive", dict(config, FTP_TLS=True), False),
+        ("FTPS session reuse", dict(config, FTP_TLS=True), True),
+    ]
+    payload = os.urandom(size)
+    names = [f".ftps_bench_{i}.bin" for i in range(files)]
+    results = {}
+    print(f"Benchmark {config['FTP_HOST']}: {files} file x {size} byte")
+    for label, cfg, reuse in modes:
+        try:
+            ftp = open_ftp(cfg, reuse_session=reuse)
+        except Exception as e:
+            print(f"  {label:<20} GAGAL connect: {e}")
+            continue
+        try:
+            try: ftp.cwd(cfg["REMOTE_DIR"])
+            except: pass
+            started = time.perf_counter()
+            for name in names: ftp.storbinary(f"STOR {name}", io.BytesIO(payload))
+            results[label] = (time.perf_counter() - started) / files * 1000
+            print(f"  {label:<20} {results[label]:8.2f} ms/file")
+            for name in names:
+                try: ftp.delete(name)
+                except: pass
+        except Exception as e:
+            print(f"  {label:<20} GAGAL: {e}")
+        finally:
+            FTPConnectionPool._close(ftp)
+    return results
+
 # ================= GIT MANAGER =================
 
 class GitManager:
@@ -128,10 +521,24 @@ class GitManager:
             command = ['git', 'show', '--pretty=', '--name-status', start_hash]
         else:
             command = ['git', 'diff', '--name-status', f'{start_hash}^', end_hash]
+        return self._name_status(command, exclude_patterns)
+
+    def get_changes_since(self, base_hash, head_hash, exclude_patterns):
+        """Perubahan setelah base_hash sampai head_hash (base sendiri tidak ikut, sudah ter-deploy)."""
+        # --no-renames: rename jadi D + A agar file lama ikut terhapus di server
+        # check=True: diff yang gagal tidak boleh terbaca sebagai "tidak ada perubahan" oleh watch mode
+        return self._name_status(['git', 'diff', '--no-renames', '--name-status', base_hash, head_hash],
+                                 exclude_patterns, check=True)
+
+    def _name_status(self, command, exclude_patterns, check=False):
+        """Parse --name-status. Jika git gagal: raise RuntimeError (check=True) atau kembalikan hasil kosong."""
         try:
             result = subprocess.run(command, cwd=self.repo_path, capture_output=True, text=True, encoding='utf-8')
+            if result.returncode != 0:
+                raise RuntimeError(result.stderr.strip() or f"git keluar dengan kode {result.returncode}")
         except Exception as e:
             log_queue.put(f"GIT DIFF ERROR: {e}")
+            if check: raise RuntimeError(f"git diff gagal: {e}") from e
             return {'added_modified': [], 'deleted': []}
         files = {'added_modified': [], 'deleted': []}
         for line in result.stdout.strip().split('\n'):
@@ -145,50 +552,324 @@ class GitManager:
             elif status.upper() == 'D': files['deleted'].append(file_path_str)
         return files
 
+# ================= ASYNC FTP ENGINE =================
+
+class _SessionReuseContext(ssl.SSLContext):
+    """SSLContext yang menyisipkan sesi TLS kontrol ke setiap handshake (asyncio tidak punya parameter session)."""
+    reuse_session = None
+
+    def wrap_bio(self, incoming, outgoing, server_side=False, server_hostname=None, session=None):
+        return super().wrap_bio(incoming, outgoing, server_side, server_hostname, session or self.reuse_session)
+
+class AsyncFTPClient:
+    """
+    Klien FTP minimal berbasis asyncio (login, PASV, STOR, DELE, MKD, MLSD, RNFR/RNTO).
+    Error mengikuti ftplib (error_perm / error_temp / error_reply) agar penanganannya sama.
+    Jika sebuah perintah dibatalkan atau timeout, koneksi ditutup karena state-nya tidak pasti lagi.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, host, user, password, port=21, timeout=30, ssl_context=None):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.port = port
+        self.timeout = timeout
+        # ssl_context harus _SessionReuseContext (satu per klien) agar koneksi data memakai sesi kontrol
+        self.ssl_context = ssl_context
+        self.reader = None
+        self.writer = None
+
+    @property
+    def connected(self):
+        return self.writer is not None and not self.writer.is_closing()
+
+    async def _wait(self, coro):
+        return await asyncio.wait_for(coro, self.timeout)
+
+    async def _readline(self):
+        if self.reader is None: raise EOFError("Koneksi kontrol tidak tersambung")
+        line = await self._wait(self.reader.readline())
+        if not line: raise EOFError("Koneksi ditutup oleh server")
+        return line.decode('utf-8', errors='replace').rstrip('\r\n')
+
+    async def _read_reply(self):
+        line = await self._readline()
+        code, lines = line[:3], [line]
+        if line[3:4] == '-':
+            while True:
+                line = await self._readline()
+                lines.append(line)
+                if line[:3] == code and line[3:4] == ' ': break
+        resp = '\n'.join(lines)
+        if code[:1] == '4': raise ftplib.error_temp(resp)
+        if code[:1] == '5': raise ftplib.error_perm(resp)
+        if code[:1] not in '123': raise ftplib.error_proto(resp)
+        return resp
+
+    async def _send(self, cmd):
+        if not self.connected: raise EOFError("Koneksi kontrol tidak tersambung")
+        self.writer.write((cmd + '\r\n').encode('utf-8'))
+        await self._wait(self.writer.drain())
+
+    async def sendcmd(self, cmd):
+        try:
+            await self._send(cmd)
+            return await self._read_reply()
+        except (asyncio.CancelledError, asyncio.TimeoutError, EOFError, OSError):
+            self.abort()
+            raise
+
+    async def voidcmd(self, cmd):
+        resp = await self.sendcmd(cmd)
+        if resp[:1] != '2': raise ftplib.error_reply(resp)
+        return resp
+
+    async def connect(self):
+        self.reader, self.writer = await self._wait(asyncio.open_connection(self.host, self.port))
+        await self._read_reply()
+        if self.ssl_context:
+            resp = await self.sendcmd('AUTH TLS')
+            if resp[:3] != '234': raise ftplib.error_reply(resp)
+            await self._wait(self.writer.start_tls(self.ssl_context, server_hostname=self.host))
+
+    async def login(self):
+        resp = await self.sendcmd(f'USER {self.user}')
+        if resp[:1] == '3': resp = await self.sendcmd(f'PASS {self.password}')
+        if resp[:1] != '2': raise ftplib.error_reply(resp)
+        if self.ssl_context:
+            await self.voidcmd('PBSZ 0')
+            await self.voidcmd('PROT P')
+            self.ssl_context.reuse_session = self.writer.get_extra_info('ssl_object').session
+        await self.voidcmd('TYPE I')
+        return resp
+
+    async def cwd(self, path): return await self.voidcmd(f'CWD {path}')
+    async def mkd(self, path): return await self.voidcmd(f'MKD {path}')
+    async def delete(self, path): return await self.voidcmd(f'DELE {path}')
+
+    async def rename(self, from_path, to_path):
+        resp = await self.sendcmd(f'RNFR {from_path}')
+        if resp[:1] != '3': raise ftplib.error_reply(resp)
+        return await self.voidcmd(f'RNTO {to_path}')
+
+    async def _open_data(self, cmd):
+        """PASV + buka koneksi data + kirim perintah transfer. Return (reader, writer) data."""
+        _, port = ftplib.parse227(await self.sendcmd('PASV'))
+        # Sama seperti ftplib: abaikan IP dari balasan PASV (sering IP internal di balik NAT)
+        data = await self._wait(asyncio.open_connection(self.host, port))
+        try:
+            resp = await self.sendcmd(cmd)
+            if resp[:1] != '1': raise ftplib.error_reply(resp)
+            if self.ssl_context:
+                await self._wait(data[1].start_tls(self.ssl_context, server_hostname=self.host))
+        except BaseException:
+            data[1].close()
+            raise
+        return data
+
+    async def storbinary(self, remote_path, fp, callback=None):
+        data_reader, data_writer = await self._open_data(f'STOR {remote_path}')
+        try:
+            while True:
+                chunk = fp.read(self.CHUNK_SIZE)
+                if not chunk: break
+                data_writer.write(chunk)
+                await self._wait(data_writer.drain())
+                if callback: callback(chunk)
+            data_writer.close()
+            await self._wait(data_writer.wait_closed())
+        except BaseException:
+            data_writer.close()
+            self.abort()
+            raise
+        return await self._void_final_reply()
+
+    async def mlsd(self, path=""):
+        cmd = f'MLSD {path}' if path else 'MLSD'
+        data_reader, data_writer = await self._open_data(cmd)
+        try:
+            raw = await self._wait(data_reader.read())
+        finally:
+            data_writer.close()
+        await self._void_final_reply()
+        entries = []
+        for line in raw.decode('utf-8', errors='replace').splitlines():
+            if not line: continue
+            facts_part, _, name = line.partition(' ')
+            facts = {}
+            for fact in facts_part[:-1].split(';'):
+                key, _, value = fact.partition('=')
+                facts[key.lower()] = value
+            entries.append((name, facts))
+        return entries
+
+    async def _void_final_reply(self):
+        try:
+            resp = await self._read_reply()
+        except (asyncio.CancelledError, asyncio.TimeoutError, EOFError, OSError):
+            self.abort()
+            raise
+        if resp[:1] != '2': raise ftplib.error_reply(resp)
+        return resp
+
+    async def quit(self):
+        if not self.connected: return
+        try: await self.voidcmd('QUIT')
+        except Exception: pass
+        self.abort()
+
+    def abort(self):
+        """Tutup koneksi kontrol tanpa basa-basi (dipakai saat cancel/timeout)."""
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+# Versi minimal untuk engine asyncio (StreamWriter.start_tls baru ada di Python 3.11)
+ASYNC_ENGINE_MIN_PYTHON = (3, 11)
+
+_async_loop = None
+_async_loop_lock = threading.Lock()
+
+def get_async_loop():
+    """
+    Event loop engine asyncio, hidup di thread sendiri selama proses berjalan. Koneksi asyncio
+    terikat ke satu loop, jadi loop ini harus bertahan agar pool bisa dipakai ulang antar deploy.
+    """
+    global _async_loop
+    with _async_loop_lock:
+        if _async_loop is None:
+            _async_loop = asyncio.new_event_loop()
+            threading.Thread(target=_async_loop.run_forever, daemon=True).start()
+        return _async_loop
+
+class AsyncFTPConnectionPool:
+    """
+    Padanan FTPConnectionPool untuk AsyncFTPClient. acquire() / release() hanya dipanggil dari
+    get_async_loop(); koneksi kontrol (login + handshake TLS) dipakai ulang oleh deploy berikutnya.
+    """
+    def __init__(self, config, max_idle=64, idle_timeout=240):
+        self.config = dict(config)
+        self.max_idle = max_idle
+        self.idle_timeout = idle_timeout
+        self._idle = []
+
+    def new_client(self):
+        config = self.config
+        return AsyncFTPClient(config["FTP_HOST"], config["FTP_USER"], config["FTP_PASS"],
+                              port=int(config.get("FTP_PORT") or 21),
+                              ssl_context=make_ftps_context(config, _SessionReuseContext) if config.get("FTP_TLS") else None)
+
+    async def acquire(self):
+        while self._idle:
+            client, last_used = self._idle.pop()
+            if time.time() - last_used < self.idle_timeout:
+                try:
+                    await client.voidcmd("NOOP")
+                    return client
+                except (ftplib.Error, OSError, EOFError, asyncio.TimeoutError): pass
+            client.abort()
+        client = self.new_client()
+        await client.connect()
+        await client.login()
+        return client
+
+    def release(self, client, broken=False):
+        if not broken and client.connected and len(self._idle) < self.max_idle:
+            self._idle.append((client, time.time()))
+        elif client.connected:
+            asyncio.ensure_future(client.quit())
+
+    def close_all(self):
+        """Tutup semua koneksi idle. Dipanggil dari thread lain, bukan dari loop engine."""
+        async def close():
+            idle, self._idle = self._idle, []
+            await asyncio.gather(*(client.quit() for client, _ in idle))
+        asyncio.run_coroutine_threadsafe(close(), get_async_loop()).result(30)
+
+_async_ftp_pools = {}
+
+def get_async_ftp_pool(config):
+    key = _pool_key(config)
+    with _ftp_pools_lock:
+        if key not in _async_ftp_pools: _async_ftp_pools[key] = AsyncFTPConnectionPool(config)
+        return _async_ftp_pools[key]
+
 # ================= FTP DEPLOYER =================
 
 class FTPDeployer:
     def __init__(self, config):
         self.host = config["FTP_HOST"]
+        self.port = int(config.get("FTP_PORT") or 21)
         self.user = config["FTP_USER"]
         self.password = config["FTP_PASS"]
         self.local_dir = Path(config["LOCAL_DIR"]).resolve()
         self.remote_dir_base = config["REMOTE_DIR"]
         self.mappings = config.get("PATH_MAPPINGS", [])
+        self.bundle_url = (config.get("BUNDLE_EXTRACT_URL") or "").strip()
+        self.bundle_min_files = int(config.get("BUNDLE_MIN_FILES") or 0)
+        self.engine = (config.get("FTP_ENGINE") or "ftplib").strip().lower()
+        self.connections = max(1, min(64, int(config.get("FTP_CONNECTIONS") or 1)))
+        self.config = config
+        self.tls = bool(config.get("FTP_TLS"))
+        self.pool = get_ftp_pool(config)
+        self.async_pool = get_async_ftp_pool(config)
+        self.verify = bool(config.get("VERIFY_UPLOADS", True))
+        self.verify_retries = int(config.get("VERIFY_RETRIES") or 0)
         self.ftp = None
+        self.cancelled = False
+        self.failed = []
+        self.ftp_broken = False
+        self._loop = None
+        self._async_task = None
+        self._reset_stats()
 
     def _log(self, message): log_queue.put(message)
 
+    def _reset_stats(self):
+        """
+        Angka mentah untuk model throughput per host (lihat record_host_stats). Hanya fase STOR
+        per-file yang diukur: login, DELE, MKD, bundle dan verifikasi tidak ikut dihitung.
+        """
+        self.stat_bytes = 0
+        self.stat_round_trips = 0
+        self.stat_upload_time = 0.0  # jumlah waktu STOR di semua koneksi (bukan waktu dinding)
+        self.stat_rtt = None
+        self.stat_compression_ratio = None
+
     def connect(self):
         try:
-            self._log(f"⚡ Menghubungkan ke {self.host}...")
-            self.ftp = ftplib.FTP(self.host, timeout=30)
-            self.ftp.login(self.user, self.password)
-            self.ftp.set_pasv(True)
+            self._log(f"⚡ Menghubungkan ke {self.host}{' (FTPS)' if self.tls else ''}...")
+            self.ftp = self.pool.acquire()
+            self.ftp_broken = False
+            started = time.perf_counter()
+            self.ftp.voidcmd("NOOP")
+            self.stat_rtt = time.perf_counter() - started
             self._log("✔️ Terhubung (Passive Mode).")
             try: self.ftp.cwd(self.remote_dir_base)
             except: self._log(f"⚠️ Gagal masuk ke {self.remote_dir_base}, di root.")
             return True
         except Exception as e:
             self._log(f"❌ FTP ERROR: {e}")
+            self.ftp_broken = True
+            self.disconnect()
             return False
 
     def disconnect(self):
+        """Kembalikan koneksi ke pool (tetap hidup untuk deploy berikutnya) kecuali state-nya rusak."""
         if self.ftp:
-            try: self.ftp.quit()
-            except: pass
+            self.pool.release(self.ftp, broken=self.ftp_broken)
+            self.ftp = None
+
+    def _note_ftp_error(self, error):
+        # Balasan 4xx/5xx tidak mengganggu percakapan kontrol. Timeout / koneksi putus / balasan tak
+        # terduga bisa meninggalkan balasan 226/426 yang belum terbaca: koneksi jangan dipakai ulang.
+        if not isinstance(error, (ftplib.error_perm, ftplib.error_temp)): self.ftp_broken = True
 
     def ensure_remote_dir(self, remote_file_path):
-        p = Path(remote_file_path)
-        parent_dir = p.parent.as_posix()
-        if parent_dir in [".", "/", ""]: return
-        parts = parent_dir.split('/')
-        current = ""
-        for part in parts:
-            if not part: continue
-            current += "/" + part
+        for current in remote_parent_dirs(remote_file_path):
             try: self.ftp.mkd(current)
-            except: pass
+            except Exception as e: self._note_ftp_error(e)
 
     def upload_file(self, local_rel_path):
         local_abs = self.local_dir / local_rel_path
@@ -212,12 +893,15 @@ class FTPDeployer:
         self._log(f"⬆️ UP: {local_rel_path} ({filesize / 1024 / 1024:.2f} MB)")
         try:
             self.ensure_remote_dir(final_remote_path)
+            started = time.perf_counter()
             with open(local_abs, 'rb') as f:
                 # Tambahkan callback di sini
                 self.ftp.storbinary(f'STOR {final_remote_path}', f, callback=progress_callback)
+            self._count_upload(filesize, time.perf_counter() - started)
             return True
         except Exception as e:
             self._log(f"❌ ERROR Upload {final_remote_path}: {e}")
+            self._note_ftp_error(e)
             return False
 
     def delete_file(self, local_rel_path):
@@ -226,17 +910,613 @@ class FTPDeployer:
         try:
             self.ftp.delete(final_remote_path)
             return True
-        except: return False
+        except Exception as e:
+            self._note_ftp_error(e)
+            return self._delete_failed(final_remote_path, e)
+
+    def _delete_failed(self, final_remote_path, error):
+        # 550: file memang sudah tidak ada di server, tujuan DELE tercapai
+        if isinstance(error, ftplib.error_perm) and str(error)[:3] == '550':
+            self._log(f"ℹ️ {final_remote_path} sudah tidak ada di server.")
+            return True
+        self._log(f"❌ ERROR Delete {final_remote_path}: {error}")
+        self.failed.append(final_remote_path)
+        return False
+
+    def _build_bundle(self, local_rel_paths):
+        """Pack file ke satu arsip zip; nama entry = path remote (sudah di-mapping)."""
+        fd, archive_path = tempfile.mkstemp(suffix=".zip")
+        os.close(fd)
+        expected = {}
+        with zipfile.ZipFile(archive_path, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for rel in local_rel_paths:
+                remote = resolve_remote_path(rel, self.mappings)
+                local_abs = self.local_dir / rel
+                zf.write(local_abs, arcname=remote)
+                expected[remote] = os.path.getsize(local_abs)
+        return archive_path, expected
+
+    def _trigger_extractor(self, script_name, token):
+        url = f"{self.bundle_url.rstrip('/')}/{script_name}?token={token}"
+        with urllib.request.urlopen(url, timeout=120) as resp:
+            payload = json.loads(resp.read().decode('utf-8') or "{}")
+        if not payload.get("ok"):
+            raise RuntimeError(payload.get("error", "extractor gagal"))
+        return payload.get("files", 0)
+
+    def _verify_sizes(self, expected):
+        """Cek SIZE remote untuk setiap file hasil ekstrak. Return list path yang tidak cocok."""
+        mismatched = []
+        try: self.ftp.voidcmd('TYPE I')
+        except Exception as e: self._note_ftp_error(e)
+        for remote, size in expected.items():
+            try: remote_size = self.ftp.size(remote)
+            except Exception as e:
+                self._note_ftp_error(e)
+                remote_size = None
+            if remote_size != size: mismatched.append(remote)
+        return mismatched
+
+    def deploy_bundle(self, local_rel_paths):
+        """
+        Upload banyak file kecil sebagai satu arsip lalu ekstrak di server via HTTP.
+        Return list file yang masih harus diupload per-file (semua file jika bundle gagal).
+        """
+        bundleable, rest = [], []
+        for rel in local_rel_paths:
+            remote = resolve_remote_path(rel, self.mappings)
+            # Path absolut / keluar dari REMOTE_DIR tidak bisa diekstrak relatif ke extractor
+            if remote.startswith('/') or '..' in remote.split('/'): rest.append(rel)
+            else: bundleable.append(rel)
+        if not bundleable: return list(local_rel_paths)
+
+        token = secrets.token_hex(16)
+        # Arsip boleh tersembunyi (hanya dibaca PHP), tapi script tidak boleh diawali titik:
+        # rule "location ~ /\." di nginx / cPanel memblokir dotfile sehingga extractor tidak bisa dipanggil
+        archive_name = f".deploy_bundle_{token[:12]}.zip"
+        script_name = f"deploy_extract_{token[:12]}.php"
+        archive_path = None
+        try:
+            archive_path, expected = self._build_bundle(bundleable)
+            archive_size = os.path.getsize(archive_path)
+            self._log(f"📦 BUNDLE: {len(bundleable)} file -> {archive_size / 1024 / 1024:.2f} MB")
+            raw_size = sum(expected.values())
+            if raw_size: self.stat_compression_ratio = archive_size / raw_size
+            with open(archive_path, 'rb') as f:
+                self.ftp.storbinary(f'STOR {archive_name}', f)
+            script = BUNDLE_EXTRACTOR_PHP.replace('__TOKEN__', token).replace('__ARCHIVE__', archive_name)
+            self.ftp.storbinary(f'STOR {script_name}', io.BytesIO(script.encode('utf-8')))
+
+            self._log("🧩 Menjalankan extractor di server...")
+            count = self._trigger_extractor(script_name, token)
+            self._log(f"✔️ Extractor selesai: {count} file.")
+        except Exception as e:
+            self._log(f"⚠️ Bundle mode gagal ({e}), fallback ke upload per-file.")
+            # Error extractor (HTTP) tidak menyentuh koneksi FTP; STOR yang putus / timeout
+            # ketahuan di sini karena DELE berikutnya ikut gagal
+            for leftover in (script_name, archive_name):
+                try: self.ftp.delete(leftover)
+                except Exception as e: self._note_ftp_error(e)
+            return list(local_rel_paths)
+        finally:
+            if archive_path:
+                try: os.remove(archive_path)
+                except: pass
+
+        mismatched = set(self._verify_sizes(expected))
+        if mismatched: self._log(f"⚠️ Verifikasi: {len(mismatched)} file tidak cocok, upload ulang per-file.")
+        else: self._log("✔️ Verifikasi ukuran file OK.")
+        return rest + [rel for rel in bundleable if resolve_remote_path(rel, self.mappings) in mismatched]
+
+    def cancel(self):
+        """Batalkan deployment yang sedang berjalan. Aman dipanggil dari thread GUI."""
+        self.cancelled = True
+        loop, task = self._loop, self._async_task
+        if loop and task:
+            loop.call_soon_threadsafe(task.cancel)
 
     def deploy(self, files_to_process):
-        if not self.connect(): return
+        """Jalankan deployment (tidak pernah tumpang tindih dengan deploy lain). Return True jika berhasil."""
         added = files_to_process.get('added_modified', [])
         deleted = files_to_process.get('deleted', [])
+        self.cancelled = False
+        self.failed = []
+        if not deploy_lock.acquire(blocking=False):
+            self._log("⏳ Menunggu deployment lain selesai...")
+            deploy_lock.acquire()
+        try:
+            self._reset_stats()
+            if self.engine == "asyncio" and sys.version_info < ASYNC_ENGINE_MIN_PYTHON:
+                self._log("⚠️ Engine asyncio butuh Python 3.11+, memakai ftplib.")
+                ok = self._deploy_ftplib(added, deleted)
+            elif self.engine == "asyncio":
+                ok = self.deploy_async(added, deleted)
+            else:
+                ok = self._deploy_ftplib(added, deleted)
+            # Deploy gagal / dibatalkan tidak mewakili kondisi host, jangan masuk model
+            if ok: self._record_stats()
+            return ok
+        finally:
+            deploy_lock.release()
+
+    def _count_upload(self, size, duration):
+        self.stat_bytes += size
+        self.stat_round_trips += stor_round_trips(self.tls)
+        self.stat_upload_time += duration
+
+    def _record_stats(self):
+        """Perbarui model per host: waktu STOR di luar round trip dianggap waktu transfer data."""
+        bytes_per_sec = None
+        if self.stat_rtt is not None and self.stat_bytes:
+            # Waktu dijumlah per koneksi, jadi hasilnya throughput per koneksi seperti di model
+            transfer_time = self.stat_upload_time - self.stat_round_trips * self.stat_rtt
+            # Terlalu kecil untuk diukur (file kecil di jaringan cepat): jangan rusak rata-rata
+            if transfer_time > 0.05: bytes_per_sec = self.stat_bytes / transfer_time
+        if self.stat_rtt is not None or bytes_per_sec or self.stat_compression_ratio is not None:
+            record_host_stats(self.host, rtt=self.stat_rtt, bytes_per_sec=bytes_per_sec,
+                              compression_ratio=self.stat_compression_ratio)
+
+    def _deploy_ftplib(self, added, deleted):
+        if not self.connect(): return False
         self._log(f"🚀 Memulai Deployment: {len(added)+len(deleted)} item.")
-        for f in deleted: self.delete_file(f)
-        for f in added: self.upload_file(f)
-        self._log("✨ Deployment Selesai Berhasil!")
+        for f in deleted:
+            if self.cancelled: break
+            self.delete_file(f)
+        if not self.cancelled and self.bundle_url and len(added) >= self.bundle_min_files:
+            added = self.deploy_bundle(added)
+        verifier = self._start_verifier()
+        try:
+            rounds = 0
+            while added and not self.cancelled:
+                for f in added:
+                    if self.cancelled: break
+                    uploaded = self.upload_file(f)
+                    if verifier and uploaded: verifier.submit(f)
+                    elif verifier: verifier.report_failed(f)
+                    elif not uploaded: self.failed.append(resolve_remote_path(f, self.mappings))
+                if not verifier or self.cancelled: break
+                added = self._next_verify_round(verifier, verifier.drain(), rounds)
+                rounds += 1
+        finally:
+            if verifier: verifier.stop()
         self.disconnect()
+        return self._finish()
+
+    def _finish(self):
+        """Log hasil akhir. Berhasil hanya jika tidak dibatalkan dan tidak ada DELE/STOR yang gagal."""
+        if self.cancelled:
+            self._log("⛔ Deployment dibatalkan.")
+            return False
+        if self.failed:
+            self._log(f"❌ Deployment selesai dengan {len(self.failed)} file gagal.")
+            return False
+        self._log("✨ Deployment Selesai Berhasil!")
+        return True
+
+    def _start_verifier(self):
+        if not self.verify: return None
+        verifier = UploadVerifier(self)
+        verifier.start()
+        return verifier
+
+    def _next_verify_round(self, verifier, mismatched, rounds):
+        """Tentukan file yang diupload ulang setelah verifikasi (dibatasi VERIFY_RETRIES)."""
+        if mismatched and rounds < self.verify_retries:
+            self._log(f"🔁 Upload ulang {len(mismatched)} file yang gagal / tidak cocok...")
+            return mismatched
+        if mismatched:
+            self._log(f"❌ Verifikasi gagal setelah {rounds} kali upload ulang: {len(mismatched)} file.")
+            for f in mismatched:
+                self._log(f"   ❌ {resolve_remote_path(f, self.mappings)}")
+                self.failed.append(resolve_remote_path(f, self.mappings))
+        unverified = verifier.unverified()
+        if unverified:
+            self._log(f"⚠️ {len(unverified)} file tidak bisa diverifikasi:")
+            for f in unverified: self._log(f"   ❔ {resolve_remote_path(f, self.mappings)}")
+        if not mismatched and not unverified: self._log("✔️ Verifikasi upload OK.")
+        return []
+
+    # ---------- asyncio engine ----------
+
+    def deploy_async(self, added, deleted):
+        """Deploy memakai AsyncFTPClient: banyak koneksi & transfer paralel dari satu thread."""
+        self._log(f"🚀 Memulai Deployment (asyncio, maks {self.connections} koneksi): {len(added)+len(deleted)} item.")
+        if self.bundle_url and len(added) >= self.bundle_min_files and self.connect():
+            added = self.deploy_bundle(added)
+            self.disconnect()
+        try:
+            # Jalan di loop engine yang persisten agar koneksi di pool tetap hidup untuk deploy berikutnya
+            asyncio.run_coroutine_threadsafe(self._deploy_async(added, deleted), get_async_loop()).result()
+            return self._finish()
+        except (asyncio.CancelledError, concurrent.futures.CancelledError):
+            # Future dari run_coroutine_threadsafe melempar CancelledError milik concurrent.futures
+            self._log("⛔ Deployment dibatalkan.")
+        except Exception as e:
+            self._log(f"❌ FTP ERROR: {e}")
+        finally:
+            self._loop = self._async_task = None
+        return False
+
+    async def _deploy_async(self, added, deleted):
+        self._loop = asyncio.get_running_loop()
+        self._async_task = asyncio.current_task()
+        if self.cancelled: raise asyncio.CancelledError()
+
+        n = max(1, min(self.connections, len(added) + len(deleted)))
+        self._log(f"⚡ Menghubungkan ke {self.host} ({n} koneksi)...")
+        tasks = [asyncio.ensure_future(self._async_acquire()) for _ in range(n)]
+        completed = False
+        try:
+            await asyncio.gather(*tasks, return_exceptions=True)
+            clients = [t.result() for t in tasks if t.exception() is None]
+            errors = [t.exception() for t in tasks if t.exception() is not None]
+            if not clients: raise errors[0]
+            # Banyak host membatasi jumlah koneksi per user (421): lanjut dengan koneksi yang terbuka
+            if errors: self._log(f"⚠️ Hanya {len(clients)} dari {n} koneksi terbuka ({errors[0]}).")
+            started = time.perf_counter()
+            await clients[0].voidcmd('NOOP')
+            self.stat_rtt = time.perf_counter() - started
+            self._log("✔️ Terhubung (Passive Mode).")
+            made_dirs = {}
+            await self._run_async_queue(clients, deleted, self._async_delete)
+            verifier = self._start_verifier()
+            try:
+                rounds = 0
+                while added:
+                    await self._run_async_queue(clients, added, lambda c, f: self._async_upload(c, f, made_dirs, verifier))
+                    if not verifier: break
+                    added = self._next_verify_round(verifier, await asyncio.to_thread(verifier.drain), rounds)
+                    rounds += 1
+            finally:
+                if verifier: verifier.stop()
+            completed = not self.cancelled
+        finally:
+            # Hanya koneksi dari deploy yang selesai normal kembali ke pool; setelah error / cancel
+            # state-nya tidak pasti (mis. balasan 226 yang belum terbaca)
+            for t in tasks:
+                if t.done() and not t.cancelled() and t.exception() is None:
+                    self.async_pool.release(t.result(), broken=not completed)
+
+    async def _async_acquire(self):
+        client = await self.async_pool.acquire()
+        try: await client.cwd(self.remote_dir_base)
+        except ftplib.Error: self._log(f"⚠️ Gagal masuk ke {self.remote_dir_base}, di root.")
+        return client
+
+    async def _async_login(self, client):
+        await client.connect()
+        await client.login()
+        try: await client.cwd(self.remote_dir_base)
+        except ftplib.Error: self._log(f"⚠️ Gagal masuk ke {self.remote_dir_base}, di root.")
+
+    async def _run_async_queue(self, clients, items, handler):
+        """Setiap koneksi menjadi satu worker yang mengambil item dari antrian bersama."""
+        queue = asyncio.Queue()
+        for item in items: queue.put_nowait(item)
+
+        async def worker(client):
+            while not queue.empty():
+                item = queue.get_nowait()
+                if not client.connected:
+                    try: await self._async_login(client)
+                    except (ftplib.Error, OSError, EOFError) as e:
+                        # Koneksi ini tidak bisa dipakai lagi (mis. 421): item diambil worker lain
+                        self._log(f"⚠️ Login ulang gagal ({e}), satu koneksi berhenti.")
+                        queue.put_nowait(item)
+                        return
+                await handler(client, item)
+
+        workers = [asyncio.ensure_future(worker(c)) for c in clients]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            # Jangan biarkan worker lain jalan terus setelah error / cancel: koneksinya akan
+            # kembali ke pool dan deploy_lock dilepas sementara STOR-nya masih berjalan
+            for w in workers: w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        if not queue.empty():
+            raise ConnectionError(f"{queue.qsize()} item tidak terproses: semua koneksi terputus")
+
+    async def _async_mkd(self, client, remote_dir):
+        try: await client.mkd(remote_dir)
+        except ftplib.Error: pass  # umumnya folder sudah ada
+        except (OSError, EOFError):
+            # Koneksi kontrol putus saat MKD: login ulang lalu coba sekali lagi
+            await self._async_login(client)
+            try: await client.mkd(remote_dir)
+            except ftplib.Error: pass
+
+    async def _async_delete(self, client, local_rel_path):
+        final_remote_path = resolve_remote_path(local_rel_path, self.mappings)
+        self._log(f"🗑️ DEL: {final_remote_path}")
+        try:
+            await client.delete(final_remote_path)
+            return True
+        except (ftplib.Error, OSError, EOFError) as e:
+            return self._delete_failed(final_remote_path, e)
+
+    async def _async_upload(self, client, local_rel_path, made_dirs, verifier=None):
+        local_abs = self.local_dir / local_rel_path
+        final_remote_path = resolve_remote_path(local_rel_path, self.mappings)
+        try:
+            self._log(f"⬆️ UP: {local_rel_path} ({os.path.getsize(local_abs) / 1024 / 1024:.2f} MB)")
+            # MKD tiap folder cukup sekali; worker lain menunggu future yang sama
+            for d in remote_parent_dirs(final_remote_path):
+                if d not in made_dirs:
+                    made_dirs[d] = asyncio.ensure_future(self._async_mkd(client, d))
+                mkd = made_dirs[d]
+                try: await mkd
+                except (ftplib.Error, OSError, EOFError):
+                    # MKD gagal jangan di-cache: file berikutnya di folder ini mencoba lagi
+                    if made_dirs.get(d) is mkd: del made_dirs[d]
+                    raise
+            # MKD yang dijalankan koneksi ini bisa saja memutus koneksi kontrol
+            if not client.connected: await self._async_login(client)
+            started = time.perf_counter()
+            with open(local_abs, 'rb') as f:
+                await client.storbinary(final_remote_path, f)
+            self._count_upload(os.path.getsize(local_abs), time.perf_counter() - started)
+            if verifier: verifier.submit(local_rel_path)
+            return True
+        except (ftplib.Error, OSError, EOFError) as e:
+            self._log(f"❌ ERROR Upload {final_remote_path}: {e}")
+            if verifier: verifier.report_failed(local_rel_path)
+            else: self.failed.append(final_remote_path)
+            return False
+
+# ================= DEPLOY PLAN & COST MODEL =================
+
+# Nilai awal model sebelum ada riwayat deploy ke host tersebut
+DEFAULT_HOST_STATS = {"rtt": 0.1, "bytes_per_sec": 1024 * 1024, "compression_ratio": 0.5, "samples": 0}
+STATS_EWMA_ALPHA = 0.3
+_stats_lock = threading.Lock()
+
+def stor_round_trips(tls):
+    """Round trip per upload: PASV, buka koneksi data, STOR/226 (+ handshake TLS di koneksi data)."""
+    return 4 if tls else 3
+
+def _stats_path():
+    return Path(__file__).parent.resolve() / STATS_FILENAME
+
+def load_host_stats(host):
+    stats = DEFAULT_HOST_STATS.copy()
+    try:
+        with open(_stats_path(), 'r', encoding='utf-8') as f:
+            stats.update(json.load(f).get(host, {}))
+    except Exception:
+        pass
+    return stats
+
+def record_host_stats(host, rtt=None, bytes_per_sec=None, compression_ratio=None):
+    """Gabungkan hasil pengukuran ke statistik per host (rata-rata bergerak eksponensial)."""
+    with _stats_lock:
+        path = _stats_path()
+        try:
+            with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
+        except Exception:
+            data = {}
+        entry = data.setdefault(host, {})
+        for key, value in (("rtt", rtt), ("bytes_per_sec", bytes_per_sec), ("compression_ratio", compression_ratio)):
+            if value is None: continue
+            old = entry.get(key)
+            entry[key] = value if old is None else old + STATS_EWMA_ALPHA * (value - old)
+        entry["samples"] = entry.get("samples", 0) + 1
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            log_queue.put(f"[STATS] Gagal menyimpan {path}: {e}")
+
+def build_deploy_plan(config, files_to_process):
+    """
+    Dry-run: hitung byte, jumlah file/folder dan round trip (MKD/STOR/DELE) tanpa menyentuh server,
+    lalu perkirakan ETA tiap strategi dari statistik host yang tersimpan.
+    """
+    local_dir = Path(config["LOCAL_DIR"]).resolve()
+    mappings = config.get("PATH_MAPPINGS", [])
+    added = files_to_process.get('added_modified', [])
+    deleted = files_to_process.get('deleted', [])
+    tls = bool(config.get("FTP_TLS"))
+
+    total_bytes, missing, dirs, mkd_per_file = 0, [], set(), 0
+    for rel in added:
+        try: total_bytes += os.path.getsize(local_dir / rel)
+        except OSError: missing.append(rel)
+        parents = remote_parent_dirs(resolve_remote_path(rel, mappings))
+        dirs.update(parents)
+        mkd_per_file += len(parents)
+
+    stats = load_host_stats(config["FTP_HOST"])
+    rtt, bw, ratio = stats["rtt"], stats["bytes_per_sec"], stats["compression_ratio"]
+    connect_rt = 4 + (3 if tls else 0)  # greeting, USER, PASS, CWD (+ AUTH TLS, PBSZ, PROT)
+    stor_rt = stor_round_trips(tls)
+    configured_engine = (config.get("FTP_ENGINE") or "ftplib").strip().lower()
+    configured_conns = max(1, min(64, int(config.get("FTP_CONNECTIONS") or 1)))
+
+    strategies = []
+    # ftplib: satu koneksi, MKD diulang untuk setiap folder induk setiap file
+    rt = connect_rt + mkd_per_file + len(added) * stor_rt + len(deleted)
+    strategies.append({"name": "ftplib (1 koneksi)", "round_trips": rt, "eta": rt * rtt + total_bytes / bw,
+                       "configured": configured_engine != "asyncio"})
+    # asyncio: MKD sekali per folder, kerja dibagi rata ke N koneksi
+    items = len(added) + len(deleted)
+    for n in sorted({2, 4, 8, 16, configured_conns}):
+        if n > max(1, items): continue
+        rt = len(dirs) + len(added) * stor_rt + len(deleted)
+        strategies.append({"name": f"asyncio x{n}", "round_trips": connect_rt + rt,
+                           "eta": connect_rt * rtt + (rt * rtt + total_bytes / bw) / n,
+                           "configured": configured_engine == "asyncio" and n == configured_conns})
+    # bundle: 2 STOR (arsip + extractor), panggilan HTTP, lalu SIZE per file untuk verifikasi
+    if added:
+        rt = connect_rt + len(deleted) + 2 * stor_rt + 2 + len(added)
+        strategies.append({"name": "bundle (zip + extractor)", "round_trips": rt,
+                           "eta": rt * rtt + total_bytes * ratio / bw,
+                           "configured": bool((config.get("BUNDLE_EXTRACT_URL") or "").strip())
+                                         and len(added) >= int(config.get("BUNDLE_MIN_FILES") or 0),
+                           "available": bool((config.get("BUNDLE_EXTRACT_URL") or "").strip())})
+
+    return {
+        "host": config["FTP_HOST"], "tls": tls,
+        "upload_files": len(added), "upload_bytes": total_bytes, "delete_files": len(deleted),
+        "directories": len(dirs), "missing": missing,
+        "mkd": mkd_per_file if configured_engine != "asyncio" else len(dirs),
+        "stor": len(added), "dele": len(deleted),
+        "verify_checks": len(added) if config.get("VERIFY_UPLOADS", True) else 0,
+        "stats": stats, "strategies": strategies,
+    }
+
+def format_deploy_plan(plan):
+    """Ringkasan plan dalam bentuk baris log."""
+    stats = plan["stats"]
+    lines = [
+        f"📐 DRY-RUN PLAN -> {plan['host'] or '(host kosong)'}{' (FTPS)' if plan['tls'] else ''}",
+        f"   Upload: {plan['upload_files']} file, {plan['upload_bytes'] / 1024 / 1024:.2f} MB | "
+        f"Hapus: {plan['delete_files']} file | Folder: {plan['directories']}",
+        f"   Round trip: MKD {plan['mkd']} · STOR {plan['stor']} · DELE {plan['dele']}"
+        + (f" (+{plan['verify_checks']} cek SIZE/HASH, paralel)" if plan['verify_checks'] else ""),
+    ]
+    if stats["samples"]:
+        lines.append(f"   Model: RTT {stats['rtt'] * 1000:.1f} ms, {stats['bytes_per_sec'] / 1024 / 1024:.2f} MB/s per koneksi, "
+                     f"rasio zip {stats['compression_ratio']:.2f} ({stats['samples']} pengukuran)")
+    else:
+        lines.append("   Model: belum ada riwayat untuk host ini, memakai nilai default (RTT 100 ms, 1 MB/s)")
+    usable = [st for st in plan["strategies"] if st.get("available", True)]
+    fastest = min(usable, key=lambda st: st["eta"]) if usable else None
+    for st in plan["strategies"]:
+        notes = []
+        if st.get("configured"): notes.append("config")
+        if st.get("available") is False: notes.append("butuh BUNDLE_EXTRACT_URL")
+        if st is fastest: notes.append("⚡ tercepat")
+        lines.append(f"   ETA {st['name']:<26} {st['eta']:8.1f} s  ({st['round_trips']} RT)"
+                     + (f"  [{', '.join(notes)}]" if notes else ""))
+    if plan["missing"]:
+        lines.append(f"   ⚠️ {len(plan['missing'])} file tidak ditemukan di lokal: {', '.join(plan['missing'][:5])}")
+    return lines
+
+# ================= WATCH MODE =================
+
+class RefWatcher:
+    """
+    Deteksi commit baru di sebuah branch tanpa menjalankan git: cukup stat() .git/HEAD,
+    file ref branch dan packed-refs, dan baca isinya hanya jika ada yang berubah.
+    """
+    def __init__(self, repo_path, branch=""):
+        self.git_dir = Path(repo_path).resolve() / '.git'
+        self.branch = branch.strip() or self.current_branch()
+        self._signature = None
+        self._head = None
+
+    def current_branch(self):
+        head = (self.git_dir / 'HEAD').read_text(encoding='utf-8').strip()
+        if head.startswith('ref: refs/heads/'): return head[len('ref: refs/heads/'):]
+        raise ValueError("HEAD dalam keadaan detached, isi WATCH_BRANCH di konfigurasi.")
+
+    def _stat_signature(self):
+        sig = []
+        for p in (self.git_dir / 'HEAD', self.git_dir / 'refs' / 'heads' / self.branch, self.git_dir / 'packed-refs'):
+            try:
+                st = p.stat()
+                sig.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except OSError:
+                sig.append(None)
+        return tuple(sig)
+
+    def read_ref(self):
+        loose = self.git_dir / 'refs' / 'heads' / self.branch
+        try:
+            return loose.read_text(encoding='utf-8').strip()
+        except OSError:
+            pass
+        try:
+            with open(self.git_dir / 'packed-refs', 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.startswith(('#', '^')): continue
+                    parts = line.split()
+                    if len(parts) == 2 and parts[1] == f'refs/heads/{self.branch}': return parts[0]
+        except OSError:
+            pass
+        return None
+
+    def poll(self):
+        """Return hash ujung branch saat ini (ref hanya dibaca ulang jika stat berubah)."""
+        sig = self._stat_signature()
+        if sig != self._signature:
+            self._signature = sig
+            self._head = self.read_ref()
+        return self._head
+
+class CommitWatcher:
+    """
+    Watch mode: tunggu commit baru di branch, kumpulkan burst commit selama WATCH_DEBOUNCE detik
+    tanpa perubahan, lalu deploy satu diff gabungan (commit terakhir ter-deploy -> ujung branch).
+    """
+    def __init__(self, config):
+        self.config = config
+        self.interval = float(config.get("WATCH_INTERVAL") or 1)
+        self.debounce = float(config.get("WATCH_DEBOUNCE") or 0)
+        self.stop_event = threading.Event()
+        self.deployer = None
+
+    def _log(self, message): log_queue.put(message)
+
+    def stop(self):
+        self.stop_event.set()
+        if self.deployer: self.deployer.cancel()
+
+    @staticmethod
+    def _check_branch(refs):
+        """File diupload dari working tree, jadi branch yang dipantau harus yang sedang di-checkout."""
+        current = refs.current_branch()
+        if current != refs.branch:
+            raise ValueError(f"WATCH_BRANCH '{refs.branch}' bukan branch yang sedang di-checkout ('{current}'). "
+                             f"Checkout branch tersebut atau kosongkan WATCH_BRANCH.")
+
+    def run(self):
+        try:
+            git = GitManager(self.config["LOCAL_DIR"])
+            refs = RefWatcher(git.repo_path, self.config.get("WATCH_BRANCH", ""))
+            self._check_branch(refs)
+        except Exception as e:
+            self._log(f"❌ WATCH ERROR: {e}")
+            return
+        deployed = refs.poll()
+        seen, changed_at = deployed, None
+        self._log(f"👀 Watch mode aktif: branch '{refs.branch}' @ {(deployed or '-')[:8]} (debounce {self.debounce:g}s)")
+        while not self.stop_event.wait(self.interval):
+            head = refs.poll()
+            if head and head != seen:
+                seen, changed_at = head, time.monotonic()
+                self._log(f"🔔 Commit baru terdeteksi: {head[:8]}, menunggu {self.debounce:g}s...")
+            if changed_at is None or time.monotonic() - changed_at < self.debounce: continue
+
+            if not deployed:
+                self._log(f"ℹ️ Branch baru, menandai {seen[:8]} sebagai titik awal.")
+                deployed, changed_at = seen, None
+                continue
+            try:
+                files = git.get_changes_since(deployed, seen, self.config["EXCLUDE_PATTERNS"])
+            except RuntimeError as e:
+                # deployed tidak digeser: commit ini dicoba lagi setelah debounce berikutnya
+                self._log(f"❌ WATCH ERROR: {e}")
+                changed_at = time.monotonic()
+                continue
+            if not (files['added_modified'] or files['deleted']):
+                self._log(f"ℹ️ {deployed[:8]}..{seen[:8]}: tidak ada file yang perlu di-deploy.")
+                deployed, changed_at = seen, None
+                continue
+            try: self._check_branch(refs)
+            except ValueError as e:
+                self._log(f"❌ WATCH ERROR: {e}")
+                break
+            self._log(f"🚀 Watch deploy {deployed[:8]}..{seen[:8]}")
+            self.deployer = FTPDeployer(self.config)
+            ok = self.deployer.deploy(files)
+            self.deployer = None
+            if ok: deployed, changed_at = seen, None
+            elif not self.stop_event.is_set():
+                # Gagal: coba lagi setelah debounce berikutnya (commit baru tetap digabung)
+                changed_at = time.monotonic()
+        self._log("👀 Watch mode berhenti.")
 
 # ================= GUI APPLICATION =================
 
@@ -247,16 +1527,22 @@ class App(tk.Tk):
         self.geometry("1200x850")
         self.configure(bg=CLR_BG)
         
-        self.config_data = load_config()
+        # Config, git history & tree lokal dimuat di background agar window langsung tampil.
+        # Sampai selesai, UI memakai placeholder dan tombol yang butuh data dinonaktifkan.
+        self.config_data = DEFAULT_CONFIG.copy()
         self.git = None
-        self.init_git()
         self.commits_data = []
         self.files_to_process = {'added_modified': [], 'deleted': []}
+        self.startup_pending = 2  # git history + tree lokal
 
         self.apply_styles()
         self.setup_ui()
         self.process_log_queue()
         self.ftp_lock = threading.Lock() 
+        self.active_deployer = None
+        self.watcher = None
+        # Worker baru dimulai saat mainloop sudah jalan (self.after dari thread lain butuh mainloop)
+        self.after(0, lambda: threading.Thread(target=self._worker_load_config, daemon=True).start())
 
     def apply_styles(self):
         self.style = ttk.Style(self)
@@ -284,11 +1570,46 @@ class App(tk.Tk):
         # Style Baru Untuk Tombol Canggih
         self.style.configure("Quick.TButton", background=CLR_QUICK, foreground=CLR_BG, font=("Segoe UI Black", 10))
 
-    def init_git(self):
-        try: self.git = GitManager(self.config_data["LOCAL_DIR"])
-        except Exception as e:
-            self.git = None
-            log_queue.put(f"[INIT] Git Error: {e}")
+    # === STARTUP DI BACKGROUND ===
+    def _worker_load_config(self):
+        config = load_config()
+        self.after(0, lambda: self._on_config_loaded(config))
+
+    def _on_config_loaded(self, config):
+        self.config_data = config
+        self.fill_config_form()
+        self.btn_save_config.config(text="💾 SAVE ALL CONFIGURATIONS", state=tk.NORMAL)
+        self.btn_watch.config(state=tk.NORMAL)
+        # Hanya load pertama yang dihitung ke startup; REFRESH / SAVE memanggil tanpa on_done
+        self.load_commits_async(on_done=self._startup_step_done)
+        self.refresh_local_root(on_done=self._startup_step_done)
+
+    def _startup_step_done(self):
+        self.startup_pending -= 1
+        if self.startup_pending == 0:
+            self.event_generate("<<StartupReady>>", when="tail")
+
+    def load_commits_async(self, on_done=None):
+        """GitManager + git log di thread worker; commit tree diisi setelah selesai, lalu on_done()."""
+        self.btn_refresh.config(state=tk.DISABLED)
+        self.btn_quick_deploy.config(state=tk.DISABLED)
+        local_dir = self.config_data["LOCAL_DIR"]
+        def worker():
+            try: git = GitManager(local_dir)
+            except Exception as e:
+                git = None
+                log_queue.put(f"[INIT] Git Error: {e}")
+            commits = git.get_recent_commits() if git else []
+            self.after(0, lambda: self._on_commits_loaded(git, commits, on_done))
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_commits_loaded(self, git, commits, on_done=None):
+        self.git = git
+        self.commits_data = commits
+        self._fill_commit_tree()
+        self.btn_refresh.config(state=tk.NORMAL)
+        self.btn_quick_deploy.config(state=tk.NORMAL)
+        if on_done: on_done()
 
     def setup_ui(self):
         self.notebook = ttk.Notebook(self)
@@ -326,15 +1647,24 @@ class App(tk.Tk):
         ttk.Label(cmd_bar, text="GIT HISTORY", font=("Segoe UI Black", 12), foreground=CLR_ACCENT).pack(side=tk.LEFT)
         
         # === TOMBOL PALING CANGGIH ===
-        self.btn_quick_deploy = ttk.Button(cmd_bar, text="⚡ QUICK DEPLOY (LATEST)", command=self.quick_auto_deploy, style="Quick.TButton")
+        self.btn_quick_deploy = ttk.Button(cmd_bar, text="⚡ QUICK DEPLOY (LATEST)", command=self.quick_auto_deploy, style="Quick.TButton", state=tk.DISABLED)
         self.btn_quick_deploy.pack(side=tk.RIGHT, padx=5)
 
         self.btn_deploy = ttk.Button(cmd_bar, text="🚀 START DEPLOY", command=self.start_deploy, state=tk.DISABLED, style="Deploy.TButton")
         self.btn_deploy.pack(side=tk.RIGHT, padx=5)
+
+        self.btn_plan = ttk.Button(cmd_bar, text="📐 PLAN", command=self.show_deploy_plan, state=tk.DISABLED)
+        self.btn_plan.pack(side=tk.RIGHT, padx=5)
+
+        self.btn_cancel = ttk.Button(cmd_bar, text="⛔ CANCEL", command=self.cancel_deploy, state=tk.DISABLED)
+        self.btn_cancel.pack(side=tk.RIGHT, padx=5)
         
-        self.btn_refresh = ttk.Button(cmd_bar, text="🔄 REFRESH", command=self.load_commits)
+        self.btn_refresh = ttk.Button(cmd_bar, text="🔄 REFRESH", command=self.load_commits_async, state=tk.DISABLED)
         self.btn_refresh.pack(side=tk.RIGHT, padx=5)
 
+        self.btn_watch = ttk.Button(cmd_bar, text="👀 WATCH: OFF", command=self.toggle_watch, state=tk.DISABLED)
+        self.btn_watch.pack(side=tk.RIGHT, padx=5)
+
         # Commit Treeview
         self.commit_tree = ttk.Treeview(commit_frame, columns=("hash", "date", "subject"), show="headings", selectmode="extended")
         self.commit_tree.heading("hash", text="HASH")
@@ -345,6 +1675,7 @@ class App(tk.Tk):
         self.commit_tree.column("subject", width=300)
         self.commit_tree.pack(fill=tk.BOTH, expand=True)
         self.commit_tree.bind("<<TreeviewSelect>>", self.on_commit_select)
+        self.commit_tree.insert("", "end", values=("", "", "⏳ Memuat git history..."))
 
         # --- RIGHT: File Diff List ---
         file_frame = ttk.LabelFrame(top_split, text=" STAGED FOR DEPLOY (MAPPED PATH) ")
@@ -370,8 +1701,6 @@ class App(tk.Tk):
         self.log_text = scrolledtext.ScrolledText(console_frame, state='disabled', font=("Consolas", 10), bg="#010409", fg="#3FB950", borderwidth=0)
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
 
-        if self.git: self.load_commits()
-
     # === LOGIC TOMBOL CANGGIH ===
     def quick_auto_deploy(self):
         """Logic: Refresh, Ambil Paling Baru, Langsung Deploy."""
@@ -439,25 +1768,38 @@ class App(tk.Tk):
         self.remote_tree.pack(fill=tk.BOTH, expand=True)
         self.remote_tree.bind("<<TreeviewOpen>>", self.on_remote_expand)
         
-        self.after(100, self.refresh_local_root)
+        self.local_tree.insert("", "end", text=" ⏳ Memuat project lokal...", values=("", "file"))
         self.browser_ftp = None
 
-    def refresh_local_root(self):
+    def refresh_local_root(self, on_done=None):
         self.local_tree.delete(*self.local_tree.get_children())
         p = os.path.abspath(self.config_data.get("LOCAL_DIR", "."))
         node = self.local_tree.insert("", "end", text=f" 📂 {os.path.basename(p)}", values=(p, "dir"), open=True)
-        self._populate_local_node(node, p)
+        self.local_tree.insert(node, "end", text="loading...")
+        self._populate_local_node(node, p, on_done)
 
-    def _populate_local_node(self, parent_node, path):
-        try:
-            entries = sorted(os.scandir(path), key=lambda e: (not e.is_dir(), e.name.lower()))
-            for entry in entries:
-                if entry.name.startswith('.'): continue
-                icon = "📁" if entry.is_dir() else "📄"
-                node = self.local_tree.insert(parent_node, "end", text=f" {icon} {entry.name}", 
-                                             values=(entry.path, "dir" if entry.is_dir() else "file"))
-                if entry.is_dir(): self.local_tree.insert(node, "end", text="loading...")
-        except: pass
+    def _populate_local_node(self, parent_node, path, on_done=None):
+        """scandir di thread worker, lalu isi node di thread UI."""
+        def worker():
+            entries = []
+            try:
+                for entry in os.scandir(path):
+                    if entry.name.startswith('.'): continue
+                    entries.append((entry.name, entry.path, entry.is_dir()))
+            except: pass
+            entries.sort(key=lambda e: (not e[2], e[0].lower()))
+
+            def fill_ui():
+                if self.local_tree.exists(parent_node):
+                    self.local_tree.delete(*self.local_tree.get_children(parent_node))
+                    for name, full_path, is_dir in entries:
+                        icon = "📁" if is_dir else "📄"
+                        node = self.local_tree.insert(parent_node, "end", text=f" {icon} {name}", 
+                                                     values=(full_path, "dir" if is_dir else "file"))
+                        if is_dir: self.local_tree.insert(node, "end", text="loading...")
+                if on_done: on_done()
+            self.after(0, fill_ui)
+        threading.Thread(target=worker, daemon=True).start()
 
     def on_local_expand(self, event):
         node = self.local_tree.focus()
@@ -466,7 +1808,7 @@ class App(tk.Tk):
         if n_type == "dir":
             children = self.local_tree.get_children(node)
             if children and self.local_tree.item(children[0], "text") == "loading...":
-                self.local_tree.delete(*children)
+                self.local_tree.item(children[0], text="⏳ loading")
                 self._populate_local_node(node, path)
 
     def refresh_remote_tree(self):
@@ -480,8 +1822,7 @@ class App(tk.Tk):
                 except: pass
             
             log_queue.put(f"DEBUG: Menghubungkan ke {cfg['FTP_HOST']}...")
-            self.browser_ftp = ftplib.FTP(cfg["FTP_HOST"], cfg["FTP_USER"], cfg["FTP_PASS"], timeout=15)
-            self.browser_ftp.set_pasv(True)
+            self.browser_ftp = open_ftp(cfg, timeout=15)
             
             root_path = cfg["REMOTE_DIR"] if cfg["REMOTE_DIR"] else "/"
             log_queue.put(f"DEBUG: Berhasil Login. Lokasi root: {root_path}")
@@ -508,8 +1849,7 @@ class App(tk.Tk):
             
             try:
                 cfg = self.config_data
-                self.browser_ftp = ftplib.FTP(cfg["FTP_HOST"], cfg["FTP_USER"], cfg["FTP_PASS"], timeout=15)
-                self.browser_ftp.set_pasv(True)
+                self.browser_ftp = open_ftp(cfg, timeout=15)
                 return True
             except Exception as e:
                 log_queue.put(f"❌ FTP Reconnect Error: {e}")
@@ -694,8 +2034,10 @@ class App(tk.Tk):
         grid.pack(fill=tk.X)
         
         flds = [
-            ("FTP HOST:", "FTP_HOST"), ("FTP USER:", "FTP_USER"), ("FTP PASS:", "FTP_PASS"),
-            ("LOCAL PROJECT ROOT:", "LOCAL_DIR"), ("REMOTE TARGET ROOT:", "REMOTE_DIR")
+            ("FTP HOST:", "FTP_HOST"), ("FTP PORT:", "FTP_PORT"), ("FTP USER:", "FTP_USER"), ("FTP PASS:", "FTP_PASS"),
+            ("LOCAL PROJECT ROOT:", "LOCAL_DIR"), ("REMOTE TARGET ROOT:", "REMOTE_DIR"),
+            ("BUNDLE EXTRACT URL:", "BUNDLE_EXTRACT_URL"),
+            ("FTP ENGINE (ftplib/asyncio):", "FTP_ENGINE"), ("FTP CONNECTIONS:", "FTP_CONNECTIONS")
         ]
 
         self.cfg_ents = {}
@@ -703,11 +2045,20 @@ class App(tk.Tk):
             ttk.Label(grid, text=lbl, font=("Segoe UI Bold", 9), foreground=CLR_TEXT_DIM).grid(row=i, column=0, sticky="w", pady=8)
             e = ttk.Entry(grid, font=("Segoe UI", 11))
             if "PASS" in lbl: e.config(show="*")
-            e.insert(0, self.config_data.get(key, ""))
             e.grid(row=i, column=1, sticky="ew", padx=15)
             self.cfg_ents[key] = e
         grid.columnconfigure(1, weight=1)
 
+        # FTPS & verifikasi (boolean -> checkbox, bukan Entry)
+        tls_row = ttk.Frame(container)
+        tls_row.pack(fill=tk.X, pady=(5, 0))
+        self.cfg_flags = {}
+        for lbl, key in [("🔒 USE FTPS (EXPLICIT TLS)", "FTP_TLS"), ("VERIFY TLS CERTIFICATE", "FTP_TLS_VERIFY"),
+                         ("✅ VERIFY UPLOADS (SIZE/HASH)", "VERIFY_UPLOADS")]:
+            var = tk.BooleanVar(value=bool(DEFAULT_CONFIG[key]))
+            ttk.Checkbutton(tls_row, text=lbl, variable=var).pack(side=tk.LEFT, padx=(0, 20))
+            self.cfg_flags[key] = var
+
         # MAPPING
         m_frame = ttk.LabelFrame(container, text=" PATH MAPPING LOGIC ", padding=15)
         m_frame.pack(fill=tk.BOTH, expand=True, pady=20)
@@ -722,11 +2073,21 @@ class App(tk.Tk):
         ttk.Button(btn_m, text="➕ ADD", command=self.add_mapping).pack(fill=tk.X, pady=2)
         ttk.Button(btn_m, text="❌ DEL", command=self.del_mapping).pack(fill=tk.X, pady=2)
 
+        # Diaktifkan setelah config selesai dimuat, agar default tidak menimpa config asli
+        self.btn_save_config = ttk.Button(container, text="⏳ LOADING CONFIGURATION...", command=self.save_config_ui,
+                                          style="Accent.TButton", state=tk.DISABLED)
+        self.btn_save_config.pack(fill=tk.X, ipady=10)
+
+    def fill_config_form(self):
+        for key, e in self.cfg_ents.items():
+            e.delete(0, tk.END)
+            e.insert(0, self.config_data.get(key, ""))
+        for key, var in self.cfg_flags.items():
+            var.set(bool(self.config_data.get(key, DEFAULT_CONFIG[key])))
+        self.map_tree.delete(*self.map_tree.get_children())
         for m in self.config_data.get("PATH_MAPPINGS", []):
             self.map_tree.insert("", "end", values=(m['local'], m['remote']))
 
-        ttk.Button(container, text="💾 SAVE ALL CONFIGURATIONS", command=self.save_config_ui, style="Accent.TButton").pack(fill=tk.X, ipady=10)
-
     def add_mapping(self):
         w = tk.Toplevel(self, bg=CLR_BG); w.title("Add Mapping")
         ttk.Label(w, text="Local Prefix:").pack(pady=5)
@@ -745,21 +2106,25 @@ class App(tk.Tk):
             v = self.map_tree.item(i)["values"]
             maps.append({"local": str(v[0]), "remote": str(v[1])})
         for k, e in self.cfg_ents.items(): self.config_data[k] = e.get()
+        for k, v in self.cfg_flags.items(): self.config_data[k] = v.get()
         self.config_data["PATH_MAPPINGS"] = maps
         if save_config(self.config_data):
             messagebox.showinfo("Success", "Configuration Secured.")
-            self.init_git(); self.load_commits()
+            self.load_commits_async()
 
     def load_commits(self):
         if not self.git: return
-        self.commit_tree.delete(*self.commit_tree.get_children())
         self.commits_data = self.git.get_recent_commits()
+        self._fill_commit_tree()
+
+    def _fill_commit_tree(self):
+        self.commit_tree.delete(*self.commit_tree.get_children())
         for c in self.commits_data:
             self.commit_tree.insert("", "end", iid=c['hash'], values=(c['hash'][:8], c['date'], c['subject']))
 
     def on_commit_select(self, event):
         sel = self.commit_tree.selection()
-        if not sel: return
+        if not sel or not self.git: return
 
         # --- FITUR BARU: COPY TO CLIPBOARD ---
         # Mengambil baris yang sedang difokuskan/diklik oleh user
@@ -789,7 +2154,16 @@ class App(tk.Tk):
         for f in self.files_to_process['deleted']:
             self.file_tree.insert("", "end", values=("DELETE", resolve_remote_path(f, maps)))
 
-        self.btn_deploy.config(state=tk.NORMAL if (self.files_to_process['added_modified'] or self.files_to_process['deleted']) else tk.DISABLED)
+        has_files = self.files_to_process['added_modified'] or self.files_to_process['deleted']
+        self.btn_deploy.config(state=tk.NORMAL if has_files else tk.DISABLED)
+        self.btn_plan.config(state=tk.NORMAL if has_files else tk.DISABLED)
+
+    def show_deploy_plan(self):
+        """Dry-run: tampilkan estimasi biaya deploy di console tanpa menyentuh server."""
+        config, files = self.config_data, self.files_to_process
+        def worker():
+            for line in format_deploy_plan(build_deploy_plan(config, files)): log_queue.put(line)
+        threading.Thread(target=worker, daemon=True).start()
 
     def start_deploy(self):
         if messagebox.askyesno("Confirm", "Deploy selected commits to server?"):
@@ -798,8 +2172,38 @@ class App(tk.Tk):
 
     def worker_deploy(self):
         deployer = FTPDeployer(self.config_data)
-        deployer.deploy(self.files_to_process)
-        self.after(0, lambda: self.btn_deploy.config(state=tk.NORMAL))
+        self.active_deployer = deployer
+        self.after(0, lambda: self.btn_cancel.config(state=tk.NORMAL))
+        try:
+            deployer.deploy(self.files_to_process)
+        finally:
+            self.active_deployer = None
+            self.after(0, lambda: self.btn_cancel.config(state=tk.DISABLED))
+            self.after(0, lambda: self.btn_deploy.config(state=tk.NORMAL))
+
+    def toggle_watch(self):
+        """Nyalakan / matikan watch mode (auto-deploy commit baru)."""
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+            self.btn_watch.config(text="👀 WATCH: OFF")
+            return
+        self.watcher = CommitWatcher(self.config_data)
+        threading.Thread(target=self._worker_watch, args=(self.watcher,), daemon=True).start()
+        self.btn_watch.config(text="👀 WATCH: ON")
+
+    def _worker_watch(self, watcher):
+        watcher.run()
+        def reset_button():
+            if self.watcher is watcher:
+                self.watcher = None
+                self.btn_watch.config(text="👀 WATCH: OFF")
+        self.after(0, reset_button)
+
+    def cancel_deploy(self):
+        if self.active_deployer:
+            log_queue.put("⛔ Membatalkan deployment...")
+            self.active_deployer.cancel()
 
     def process_log_queue(self):
         try:
@@ -812,6 +2216,89 @@ class App(tk.Tk):
         except: pass
         self.after(100, self.process_log_queue)
 
+def benchmark_startup(runs=3):
+    """
+    Ukur time-to-first-paint (window tampil & tergambar) dan waktu sampai config, git history
+    dan tree lokal selesai dimuat di background, dihitung dari awal pembuatan App.
+    """
+    print(f"Startup benchmark ({runs}x)")
+    for i in range(runs):
+        started = time.perf_counter()
+        app = App()
+        marks = {}
+
+        def on_map(event):
+            # Redraw Tk dijadwalkan sebagai idle task, jadi idle berikutnya = setelah paint pertama
+            if event.widget is app and 'paint' not in marks:
+                app.after_idle(lambda: marks.setdefault('paint', time.perf_counter()))
+
+        def on_ready(event):
+            marks['ready'] = time.perf_counter()
+            app.after(50, app.destroy)
+
+        app.bind("<Map>", on_map, add="+")
+        app.bind("<<StartupReady>>", on_ready, add="+")
+        app.after(60000, app.destroy)
+        app.mainloop()
+
+        paint = (marks['paint'] - started) * 1000 if 'paint' in marks else float('nan')
+        ready = (marks['ready'] - started) * 1000 if 'ready' in marks else float('nan')
+        print(f"  run {i + 1}: first paint {paint:8.1f} ms | data siap {ready:8.1f} ms")
+
 if __name__ == "__main__":
-    app = App()
-    app.mainloop()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Smart Git-FTP Deployer")
+    parser.add_argument("--bench-ftps", action="store_true",
+                        help="Benchmark overhead per file: FTP vs FTPS naif vs FTPS session reuse")
+    parser.add_argument("--bench-files", type=int, default=30, help="Jumlah file benchmark (default 30)")
+    parser.add_argument("--bench-size", type=int, default=1024, help="Ukuran tiap file benchmark dalam byte")
+    parser.add_argument("--bench-host", help="Server test untuk --bench-ftps (default: server FTPS lokal ftp_standin.py). "
+                                             "deploy_config.json tidak pernah dipakai untuk benchmark")
+    parser.add_argument("--bench-port", type=int, default=21, help="Port server test (default 21)")
+    parser.add_argument("--bench-user", default="anonymous", help="Username server test")
+    parser.add_argument("--bench-pass", default="", help="Password server test")
+    parser.add_argument("--bench-dir", default="/", help="Folder di server test untuk file .ftps_bench_*")
+    parser.add_argument("--bench-cert", help="Sertifikat PEM untuk server FTPS lokal (default: self-signed via openssl)")
+    parser.add_argument("--bench-key", help="Private key PEM untuk --bench-cert")
+    parser.add_argument("--bench-startup", action="store_true",
+                        help="Ukur time-to-first-paint GUI dan waktu sampai data startup selesai dimuat")
+    parser.add_argument("--plan", metavar="OLDEST..NEWEST",
+                        help="Dry-run: estimasi biaya deploy untuk rentang commit (inklusif, seperti pilihan di GUI)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Tanpa GUI: auto-deploy setiap commit baru di WATCH_BRANCH (Ctrl+C untuk berhenti)")
+    args = parser.parse_args()
+
+    if args.bench_ftps:
+        server = None
+        if args.bench_host:
+            bench_cfg = dict(DEFAULT_CONFIG, FTP_HOST=args.bench_host, FTP_PORT=args.bench_port, FTP_USER=args.bench_user,
+                             FTP_PASS=args.bench_pass, REMOTE_DIR=args.bench_dir, FTP_TLS_VERIFY=False)
+        else:
+            try:
+                server, bench_cfg = start_benchmark_server(args.bench_cert, args.bench_key or args.bench_cert)
+            except (OSError, subprocess.CalledProcessError) as e:
+                sys.exit(f"Gagal menjalankan server FTPS lokal ({e}). Pasang openssl, berikan --bench-cert/--bench-key, "
+                         f"atau pakai --bench-host untuk server test lain.")
+        try:
+            benchmark_ftps(bench_cfg, args.bench_files, args.bench_size)
+        finally:
+            if server: server.stop()
+    elif args.bench_startup:
+        benchmark_startup()
+    elif args.plan:
+        cfg = load_config()
+        oldest, _, newest = args.plan.partition('..')
+        files = GitManager(cfg["LOCAL_DIR"]).get_changed_files(oldest, newest or oldest, cfg["EXCLUDE_PATTERNS"])
+        for line in format_deploy_plan(build_deploy_plan(cfg, files)): print(line)
+    elif args.watch:
+        def print_log_queue():
+            while True: print(f"[{time.strftime('%H:%M:%S')}] {log_queue.get()}", flush=True)
+        threading.Thread(target=print_log_queue, daemon=True).start()
+        watcher = CommitWatcher(load_config())
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            watcher.stop()
+        time.sleep(0.2)  # beri waktu log terakhir tercetak
+    else:
+        app = App()
+        app.mainloop()
\ No newline at end of file
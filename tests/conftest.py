@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import smart_deploy
+from ftp_standin import StandinExtractorServer, StandinFTPServer
+
+
+@pytest.fixture(autouse=True)
+def isolated_stats(tmp_path, monkeypatch):
+    """Jangan sentuh deploy_stats.json asli; tutup pool koneksi setelah tiap test."""
+    monkeypatch.setattr(smart_deploy, "_stats_path", lambda: tmp_path / "deploy_stats.json")
+    yield
+    with smart_deploy._ftp_pools_lock:
+        pools = list(smart_deploy._ftp_pools.values()) + list(smart_deploy._async_ftp_pools.values())
+        smart_deploy._ftp_pools.clear()
+        smart_deploy._async_ftp_pools.clear()
+    for pool in pools: pool.close_all()
+
+
+@pytest.fixture
+def ftp_server():
+    with StandinFTPServer() as server:
+        yield server
+
+
+@pytest.fixture
+def extractor(ftp_server):
+    with StandinExtractorServer(ftp_server) as server:
+        yield server
+
+
+@pytest.fixture
+def local_dir(tmp_path):
+    root = tmp_path / "site"
+    (root / "assets").mkdir(parents=True)
+    for i in range(5):
+        (root / "assets" / f"file{i}.txt").write_text(f"isi file {i}\n" * (i + 1))
+    (root / "index.php").write_text("<?php echo 'ok';\n")
+    return root
+
+
+@pytest.fixture
+def config(ftp_server, local_dir):
+    cfg = smart_deploy.DEFAULT_CONFIG.copy()
+    cfg.update({"FTP_HOST": ftp_server.host, "FTP_PORT": ftp_server.port,
+                "FTP_USER": ftp_server.user, "FTP_PASS": ftp_server.password,
+                "LOCAL_DIR": str(local_dir), "REMOTE_DIR": "/", "PATH_MAPPINGS": {}})
+    return cfg
+
+
+@pytest.fixture
+def logs():
+    """Kumpulkan pesan log_queue yang ditulis selama test."""
+    while not smart_deploy.log_queue.empty(): smart_deploy.log_queue.get_nowait()
+    collected = []
+
+    def read():
+        while not smart_deploy.log_queue.empty(): collected.append(smart_deploy.log_queue.get_nowait())
+        return collected
+    return read
@@ -0,0 +1,151 @@
+import asyncio
+import shutil
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import smart_deploy
+
+
+def _files(local_dir):
+    return sorted(p.relative_to(local_dir).as_posix() for p in local_dir.rglob("*") if p.is_file())
+
+
+@pytest.mark.parametrize("connections", [1, 4])
+def test_connection_dropped_during_mkd(ftp_server, config, local_dir, connections):
+    config.update({"FTP_ENGINE": "asyncio", "FTP_CONNECTIONS": connections})
+    ftp_server.drop_on_mkd = 1
+
+    assert smart_deploy.FTPDeployer(config).deploy({"added_modified": _files(local_dir), "deleted": []})
+    assert sorted(ftp_server.files) == _files(local_dir)
+    assert "assets" in ftp_server.dirs
+
+
+def test_commands_fail_cleanly_when_not_connected():
+    client = smart_deploy.AsyncFTPClient("127.0.0.1", "test", "test")
+    with pytest.raises(EOFError):
+        smart_deploy.asyncio.run(client.voidcmd("NOOP"))
+
+
+def test_control_connections_are_pooled_across_deploys(ftp_server, config, local_dir):
+    config.update({"FTP_ENGINE": "asyncio", "FTP_CONNECTIONS": 2, "VERIFY_UPLOADS": False})
+    files = {"added_modified": _files(local_dir), "deleted": []}
+
+    assert smart_deploy.FTPDeployer(config).deploy(files)
+    assert smart_deploy.FTPDeployer(config).deploy(files)
+    assert ftp_server.commands.count("USER") == 2
+
+
+@pytest.fixture
+def ftps_server():
+    if not shutil.which("openssl"): pytest.skip("openssl tidak tersedia")
+    server, config = smart_deploy.start_benchmark_server()
+    server.require_session_reuse = True
+    yield server, config
+    server.stop()
+
+
+@pytest.mark.skipif(sys.version_info < smart_deploy.ASYNC_ENGINE_MIN_PYTHON, reason="butuh StreamWriter.start_tls")
+def test_ftps_data_connections_reuse_control_session(ftps_server, local_dir):
+    server, config = ftps_server
+    config.update({"FTP_TLS": True, "FTP_ENGINE": "asyncio", "FTP_CONNECTIONS": 2, "LOCAL_DIR": str(local_dir)})
+
+    assert smart_deploy.FTPDeployer(config).deploy({"added_modified": _files(local_dir), "deleted": []})
+    assert sorted(server.files) == _files(local_dir)
+    assert server.data_sessions_reused and all(server.data_sessions_reused)
+
+
+def test_benchmark_uses_local_standin(ftps_server):
+    server, config = ftps_server
+    server.require_session_reuse = False
+
+    results = smart_deploy.benchmark_ftps(config, files=3, size=256)
+
+    assert set(results) == {"plain FTP", "FTPS naive", "FTPS session reuse"}
+    assert not server.files  # file .ftps_bench_* dihapus lagi
+
+
+def test_cancel_in_flight_deploy(ftp_server, config, tmp_path, logs):
+    site = tmp_path / "many"
+    site.mkdir()
+    for i in range(200): (site / f"f{i:03}.txt").write_text(f"{i}\n")
+    config.update({"FTP_ENGINE": "asyncio", "FTP_CONNECTIONS": 2, "LOCAL_DIR": str(site), "VERIFY_UPLOADS": False})
+    ftp_server.stor_delay = 0.02
+    deployer = smart_deploy.FTPDeployer(config)
+    timer = threading.Timer(0.15, deployer.cancel)
+    timer.start()
+
+    assert not deployer.deploy({"added_modified": _files(site), "deleted": []})
+    timer.join()
+
+    lines = logs()
+    assert any("Deployment dibatalkan" in line for line in lines)
+    assert not any("FTP ERROR" in line for line in lines)
+    assert len(ftp_server.files) < 200
+
+
+def test_deploy_continues_with_connections_that_opened(ftp_server, config, local_dir, logs):
+    config.update({"FTP_ENGINE": "asyncio", "FTP_CONNECTIONS": 4})
+    ftp_server.max_connections = 2
+
+    assert smart_deploy.FTPDeployer(config).deploy({"added_modified": _files(local_dir), "deleted": []})
+    assert sorted(ftp_server.files) == _files(local_dir)
+    assert any("Hanya 2 dari 4 koneksi" in line for line in logs())
+
+
+def test_failing_worker_stops_sibling_workers(config):
+    deployer = smart_deploy.FTPDeployer(config)
+    running = []
+
+    async def handler(client, item):
+        if item == "boom": raise RuntimeError("boom")
+        running.append(item)
+        try: await asyncio.sleep(5)
+        finally: running.remove(item)
+
+    async def run():
+        clients = [SimpleNamespace(connected=True) for _ in range(2)]
+        with pytest.raises(RuntimeError):
+            await deployer._run_async_queue(clients, ["slow", "boom"], handler)
+        # Tidak ada worker yang masih memakai koneksi saat error sampai ke _deploy_async
+        return list(running)
+
+    assert asyncio.run(run()) == []
+
+
+def test_worker_that_cannot_log_in_again_hands_over_its_items(config, logs):
+    deployer = smart_deploy.FTPDeployer(config)
+    handled = []
+
+    async def refuse_login(client):
+        raise smart_deploy.ftplib.error_temp("421 Too many connections")
+    deployer._async_login = refuse_login
+
+    async def handler(client, item):
+        handled.append(item)
+        await asyncio.sleep(0)
+
+    clients = [SimpleNamespace(connected=False), SimpleNamespace(connected=True)]
+    asyncio.run(deployer._run_async_queue(clients, ["a", "b", "c"], handler))
+
+    assert sorted(handled) == ["a", "b", "c"]
+    assert any("Login ulang gagal" in line for line in logs())
+
+
+def test_failed_mkd_is_retried_by_the_next_file(ftp_server, config, local_dir):
+    config.update({"FTP_ENGINE": "asyncio", "FTP_CONNECTIONS": 1, "VERIFY_UPLOADS": False})
+    deployer = smart_deploy.FTPDeployer(config)
+    original, calls = deployer._async_mkd, []
+
+    async def flaky_mkd(client, remote_dir):
+        calls.append(remote_dir)
+        if len(calls) == 1: raise smart_deploy.ftplib.error_perm("530 Not logged in")
+        await original(client, remote_dir)
+    deployer._async_mkd = flaky_mkd
+
+    assert not deployer.deploy({"added_modified": _files(local_dir), "deleted": []})
+    # Hanya file pertama di assets/ yang gagal, sisanya memicu MKD baru dan terupload
+    assert deployer.failed == ["assets/file0.txt"]
+    assert len(calls) == 2
@@ -0,0 +1,48 @@
+import smart_deploy
+
+
+def _local_files(local_dir):
+    return sorted(p.relative_to(local_dir).as_posix() for p in local_dir.rglob("*") if p.is_file())
+
+
+def _bundle_config(config, url):
+    config.update({"BUNDLE_EXTRACT_URL": url, "BUNDLE_MIN_FILES": 2, "VERIFY_UPLOADS": False})
+    return config
+
+
+def test_bundle_extracts_on_server(ftp_server, extractor, config, local_dir):
+    files = _local_files(local_dir)
+    deployer = smart_deploy.FTPDeployer(_bundle_config(config, extractor.url))
+
+    assert deployer.deploy({"added_modified": files, "deleted": []})
+
+    assert sorted(ftp_server.files) == files
+    for rel in files:
+        assert ftp_server.files[rel] == (local_dir / rel).read_bytes()
+    # Satu STOR arsip + satu STOR script, tanpa upload per-file
+    assert ftp_server.commands.count("STOR") == 2
+    assert len(extractor.requests) == 1
+    assert not extractor.requests[0].startswith(".")
+
+
+def test_bundle_falls_back_to_per_file_upload(ftp_server, extractor, config, local_dir):
+    extractor.available = False
+    files = _local_files(local_dir)
+    deployer = smart_deploy.FTPDeployer(_bundle_config(config, extractor.url))
+
+    assert deployer.deploy({"added_modified": files, "deleted": []})
+
+    # Arsip dan script sisa bundle sudah dihapus, semua file terupload satu per satu
+    assert sorted(ftp_server.files) == files
+    assert ftp_server.commands.count("STOR") == 2 + len(files)
+    assert len(extractor.requests) == 1
+
+
+def test_bundle_falls_back_for_asyncio_engine(ftp_server, extractor, config, local_dir):
+    extractor.available = False
+    files = _local_files(local_dir)
+    config["FTP_ENGINE"] = "asyncio"
+    deployer = smart_deploy.FTPDeployer(_bundle_config(config, extractor.url))
+
+    assert deployer.deploy({"added_modified": files, "deleted": []})
+    assert sorted(ftp_server.files) == files
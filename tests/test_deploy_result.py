@@ -0,0 +1,171 @@
+import subprocess
+import threading
+import time
+
+import pytest
+
+import smart_deploy
+
+
+@pytest.fixture(params=["ftplib", "asyncio"])
+def engine_config(request, config):
+    config["FTP_ENGINE"] = request.param
+    return config
+
+
+def _files(local_dir):
+    return sorted(p.relative_to(local_dir).as_posix() for p in local_dir.rglob("*") if p.is_file())
+
+
+def test_deploy_succeeds(ftp_server, engine_config, local_dir):
+    assert smart_deploy.FTPDeployer(engine_config).deploy({"added_modified": _files(local_dir), "deleted": []})
+    assert sorted(ftp_server.files) == _files(local_dir)
+
+
+@pytest.mark.parametrize("verify", [False, True])
+def test_failed_upload_fails_deploy(ftp_server, engine_config, local_dir, verify):
+    engine_config.update({"VERIFY_UPLOADS": verify, "VERIFY_RETRIES": 1})
+    ftp_server.reject_stor = lambda path: path == "index.php"
+
+    deployer = smart_deploy.FTPDeployer(engine_config)
+    assert not deployer.deploy({"added_modified": _files(local_dir), "deleted": []})
+    assert deployer.failed == ["index.php"]
+
+
+def test_deleting_missing_file_is_not_a_failure(ftp_server, engine_config):
+    ftp_server.files["old.txt"] = b"x"
+    deployer = smart_deploy.FTPDeployer(engine_config)
+    assert deployer.deploy({"added_modified": [], "deleted": ["old.txt", "gone.txt"]})
+    assert "old.txt" not in ftp_server.files
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), *args], check=True, capture_output=True)
+
+
+@pytest.fixture
+def repo(local_dir):
+    _git(local_dir, "init", "-q", "-b", "main")
+    _git(local_dir, "config", "user.email", "test@example.com")
+    _git(local_dir, "config", "user.name", "test")
+    _git(local_dir, "add", "-A")
+    _git(local_dir, "commit", "-q", "-m", "awal")
+    return local_dir
+
+
+def _wait_for(logs, text, timeout=15):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if any(text in line for line in logs()): return True
+        time.sleep(0.05)
+    return False
+
+
+def test_watch_rejects_branch_other_than_checked_out(repo, config, logs):
+    _git(repo, "branch", "other")
+    config["WATCH_BRANCH"] = "other"
+    smart_deploy.CommitWatcher(config).run()
+    assert any("bukan branch yang sedang di-checkout" in line for line in logs())
+
+
+def test_watch_retries_until_deploy_succeeds(ftp_server, repo, config, logs):
+    config.update({"WATCH_INTERVAL": 0.05, "WATCH_DEBOUNCE": 0, "VERIFY_UPLOADS": False})
+    ftp_server.reject_stor = lambda path: True
+    watcher = smart_deploy.CommitWatcher(config)
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    try:
+        assert _wait_for(logs, "Watch mode aktif")
+        (repo / "baru.txt").write_text("baru\n")
+        _git(repo, "add", "baru.txt")
+        _git(repo, "commit", "-q", "-m", "baru")
+
+        assert _wait_for(logs, "1 file gagal")
+        assert "baru.txt" not in ftp_server.files
+        ftp_server.reject_stor = None
+        # Commit yang sama di-deploy ulang karena deploy sebelumnya gagal
+        assert _wait_for(logs, "Deployment Selesai Berhasil")
+        assert ftp_server.files["baru.txt"] == b"baru\n"
+    finally:
+        watcher.stop()
+        thread.join(5)
+
+
+def test_connection_with_timed_out_stor_is_not_reused(ftp_server, config, local_dir, monkeypatch):
+    config.update({"VERIFY_UPLOADS": False})
+    (local_dir / "big.bin").write_bytes(b"x" * 16 * 1024 * 1024)
+    deployer = smart_deploy.FTPDeployer(config)
+    connect = deployer.connect
+
+    def connect_with_short_data_timeout():
+        ok = connect()
+        deployer.ftp.timeout = 0.3  # dipakai untuk koneksi data berikutnya
+        return ok
+    monkeypatch.setattr(deployer, "connect", connect_with_short_data_timeout)
+    ftp_server.stor_stall = 1
+    assert not deployer.deploy({"added_modified": ["big.bin"], "deleted": []})
+
+    # Server masih akan mengirim 226 untuk STOR yang timeout: balasan itu tidak boleh
+    # terbaca sebagai balasan NOOP / perintah deploy berikutnya
+    ftp_server.stor_stall = 0
+    time.sleep(1.5)
+    assert smart_deploy.FTPDeployer(config).deploy({"added_modified": _files(local_dir), "deleted": []})
+    assert ftp_server.commands.count("USER") == 2
+
+
+def _start_watcher(config):
+    watcher = smart_deploy.CommitWatcher(config)
+    thread = threading.Thread(target=watcher.run, daemon=True)
+    thread.start()
+    return watcher, thread
+
+
+def _commit_file(repo, name, text):
+    (repo / name).write_text(text)
+    _git(repo, "add", name)
+    _git(repo, "commit", "-q", "-m", name)
+
+
+def test_failed_git_diff_raises(repo):
+    with pytest.raises(RuntimeError):
+        smart_deploy.GitManager(repo).get_changes_since("0" * 40, "HEAD", [])
+
+
+def test_watch_burst_of_commits_is_deployed_once(ftp_server, repo, config, logs):
+    config.update({"WATCH_INTERVAL": 0.05, "WATCH_DEBOUNCE": 1.5, "VERIFY_UPLOADS": False})
+    watcher, thread = _start_watcher(config)
+    try:
+        assert _wait_for(logs, "Watch mode aktif")
+        for i in range(3): _commit_file(repo, f"burst{i}.txt", f"{i}\n")
+
+        assert _wait_for(logs, "Deployment Selesai Berhasil")
+        time.sleep(0.5)
+        assert sum("Watch deploy" in line for line in logs()) == 1
+        assert sorted(f for f in ftp_server.files if f.startswith("burst")) == ["burst0.txt", "burst1.txt", "burst2.txt"]
+    finally:
+        watcher.stop()
+        thread.join(5)
+
+
+def test_watch_keeps_deployed_commit_when_git_diff_fails(ftp_server, repo, config, logs, monkeypatch):
+    config.update({"WATCH_INTERVAL": 0.05, "WATCH_DEBOUNCE": 0, "VERIFY_UPLOADS": False})
+    original, calls = smart_deploy.GitManager.get_changes_since, []
+
+    def flaky_diff(self, base, head, exclude):
+        calls.append((base, head))
+        if len(calls) == 1: raise RuntimeError("git diff gagal: simulasi")
+        return original(self, base, head, exclude)
+    monkeypatch.setattr(smart_deploy.GitManager, "get_changes_since", flaky_diff)
+
+    watcher, thread = _start_watcher(config)
+    try:
+        assert _wait_for(logs, "Watch mode aktif")
+        _commit_file(repo, "baru.txt", "baru\n")
+
+        assert _wait_for(logs, "Deployment Selesai Berhasil")
+        # Percobaan kedua memakai base yang sama: commit tidak dilewati
+        assert calls[0] == calls[1]
+        assert ftp_server.files["baru.txt"] == b"baru\n"
+    finally:
+        watcher.stop()
+        thread.join(5)
@@ -0,0 +1,86 @@
+import pytest
+
+import smart_deploy
+
+
+def _files(local_dir):
+    return sorted(p.relative_to(local_dir).as_posix() for p in local_dir.rglob("*") if p.is_file())
+
+
+def _fastest(plan):
+    line = next(line for line in smart_deploy.format_deploy_plan(plan) if "tercepat" in line)
+    return next(st["name"] for st in plan["strategies"] if st["name"] in line)
+
+
+def test_counts_bytes_files_and_directories(config, local_dir):
+    files = _files(local_dir)
+    plan = smart_deploy.build_deploy_plan(config, {"added_modified": files, "deleted": ["old.txt"]})
+
+    assert plan["upload_files"] == len(files)
+    assert plan["upload_bytes"] == sum((local_dir / f).stat().st_size for f in files)
+    assert plan["delete_files"] == plan["dele"] == 1
+    assert plan["stor"] == len(files)
+    assert plan["directories"] == 1
+    assert plan["missing"] == []
+
+
+@pytest.mark.parametrize("engine, mkd", [("ftplib", 5 + 2), ("asyncio", 3)])
+def test_mkd_count_per_engine(config, local_dir, engine, mkd):
+    (local_dir / "a" / "b").mkdir(parents=True)
+    (local_dir / "a" / "b" / "c.txt").write_text("c\n")
+    config["FTP_ENGINE"] = engine
+    files = [f for f in _files(local_dir) if f != "index.php"]
+
+    plan = smart_deploy.build_deploy_plan(config, {"added_modified": files, "deleted": []})
+
+    # ftplib mengulang MKD setiap folder induk untuk setiap file, asyncio sekali per folder
+    assert plan["directories"] == 3
+    assert plan["mkd"] == mkd
+
+
+def test_missing_local_file_is_listed(config, local_dir):
+    plan = smart_deploy.build_deploy_plan(config, {"added_modified": ["index.php", "hilang.txt"], "deleted": []})
+
+    assert plan["missing"] == ["hilang.txt"]
+    assert plan["upload_bytes"] == (local_dir / "index.php").stat().st_size
+    assert any("1 file tidak ditemukan di lokal: hilang.txt" in line for line in smart_deploy.format_deploy_plan(plan))
+
+
+def test_eta_uses_default_stats_without_history(config, local_dir):
+    files = _files(local_dir)
+    plan = smart_deploy.build_deploy_plan(config, {"added_modified": files, "deleted": []})
+    defaults = smart_deploy.DEFAULT_HOST_STATS
+    ftplib_plan = plan["strategies"][0]
+
+    assert plan["stats"]["samples"] == 0
+    assert ftplib_plan["eta"] == pytest.approx(ftplib_plan["round_trips"] * defaults["rtt"]
+                                               + plan["upload_bytes"] / defaults["bytes_per_sec"])
+    assert any("belum ada riwayat" in line for line in smart_deploy.format_deploy_plan(plan))
+
+
+def test_eta_uses_stored_stats(config, local_dir):
+    smart_deploy.record_host_stats(config["FTP_HOST"], rtt=0.5, bytes_per_sec=2048, compression_ratio=0.25)
+    files = _files(local_dir)
+    plan = smart_deploy.build_deploy_plan(config, {"added_modified": files, "deleted": []})
+    ftplib_plan = plan["strategies"][0]
+
+    assert plan["stats"]["samples"] == 1
+    assert ftplib_plan["eta"] == pytest.approx(ftplib_plan["round_trips"] * 0.5 + plan["upload_bytes"] / 2048)
+    assert any("RTT 500.0 ms" in line for line in smart_deploy.format_deploy_plan(plan))
+
+
+def test_fastest_strategy_follows_stored_stats(config, local_dir):
+    files = _files(local_dir)
+    host = config["FTP_HOST"]
+    todo = {"added_modified": files, "deleted": []}
+
+    # Latensi tinggi, bandwidth besar: paralel menang
+    smart_deploy.record_host_stats(host, rtt=1.0, bytes_per_sec=100 * 1024 * 1024, compression_ratio=1.0)
+    assert _fastest(smart_deploy.build_deploy_plan(config, todo)).startswith("asyncio")
+
+    # Bundle lebih murah, tapi tidak pernah dipilih tanpa BUNDLE_EXTRACT_URL
+    smart_deploy._stats_path().unlink()
+    smart_deploy.record_host_stats(host, rtt=0.001, bytes_per_sec=10, compression_ratio=0.01)
+    assert _fastest(smart_deploy.build_deploy_plan(config, todo)) != "bundle (zip + extractor)"
+    config["BUNDLE_EXTRACT_URL"] = "http://127.0.0.1/"
+    assert _fastest(smart_deploy.build_deploy_plan(config, todo)) == "bundle (zip + extractor)"
@@ -0,0 +1,47 @@
+import pytest
+
+import smart_deploy
+
+
+def _files(local_dir):
+    return sorted(p.relative_to(local_dir).as_posix() for p in local_dir.rglob("*") if p.is_file())
+
+
+@pytest.fixture(params=["ftplib", "asyncio"])
+def engine_config(request, config):
+    config.update({"FTP_ENGINE": request.param, "VERIFY_UPLOADS": False})
+    return config
+
+
+def test_successful_deploy_records_one_sample(ftp_server, engine_config, local_dir):
+    assert smart_deploy.FTPDeployer(engine_config).deploy({"added_modified": _files(local_dir), "deleted": []})
+
+    stats = smart_deploy.load_host_stats(ftp_server.host)
+    assert stats["samples"] == 1
+    assert stats["rtt"] != smart_deploy.DEFAULT_HOST_STATS["rtt"]
+
+
+def test_bundle_deploy_records_one_sample(ftp_server, extractor, engine_config, local_dir):
+    engine_config.update({"BUNDLE_EXTRACT_URL": extractor.url, "BUNDLE_MIN_FILES": 2})
+    assert smart_deploy.FTPDeployer(engine_config).deploy({"added_modified": _files(local_dir), "deleted": []})
+
+    stats = smart_deploy.load_host_stats(ftp_server.host)
+    assert stats["samples"] == 1
+    assert stats["compression_ratio"] != smart_deploy.DEFAULT_HOST_STATS["compression_ratio"]
+
+
+def test_failed_deploy_records_nothing(ftp_server, extractor, engine_config, local_dir):
+    engine_config.update({"BUNDLE_EXTRACT_URL": extractor.url, "BUNDLE_MIN_FILES": 2})
+    extractor.available = False
+    ftp_server.reject_stor = lambda path: path == "index.php"
+
+    assert not smart_deploy.FTPDeployer(engine_config).deploy({"added_modified": _files(local_dir), "deleted": []})
+    assert not smart_deploy._stats_path().exists()
+
+
+def test_only_upload_phase_is_timed(ftp_server, engine_config, local_dir):
+    deployer = smart_deploy.FTPDeployer(engine_config)
+    assert deployer.deploy({"added_modified": _files(local_dir), "deleted": ["a.txt", "b.txt"]})
+
+    assert deployer.stat_bytes == sum((local_dir / f).stat().st_size for f in _files(local_dir))
+    assert deployer.stat_round_trips == len(_files(local_dir)) * smart_deploy.stor_round_trips(False)
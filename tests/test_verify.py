@@ -0,0 +1,72 @@
+import pytest
+
+import smart_deploy
+from smart_deploy import parse_hash_reply
+
+
+@pytest.mark.parametrize("resp, algo, expected", [
+    ("250 1A2B3C4D", "CRC32", 0x1A2B3C4D),
+    ("250 cafe 1A2B3C4D", "CRC32", 0x1A2B3C4D),
+    ("250 deadbeef 1A2B3C4D", "CRC32", 0x1A2B3C4D),
+    ("250 cafe", "CRC32", None),
+    ("250 " + "ab" * 16, "MD5", int("ab" * 16, 16)),
+    ("213 SHA-256 0-10 " + "0f" * 32 + " index.php", "SHA-256", int("0f" * 32, 16)),
+    ("213 SHA-256 0-10 cafe", "SHA-256", None),
+])
+def test_parse_hash_reply(resp, algo, expected):
+    assert parse_hash_reply(resp, algo) == expected
+
+
+@pytest.fixture(params=["ftplib", "asyncio"])
+def engine_config(request, config):
+    config.update({"FTP_ENGINE": request.param, "VERIFY_UPLOADS": True, "VERIFY_RETRIES": 2})
+    return config
+
+
+def _files(local_dir):
+    return sorted(p.relative_to(local_dir).as_posix() for p in local_dir.rglob("*") if p.is_file())
+
+
+def test_failed_stor_is_uploaded_again(ftp_server, engine_config, local_dir, logs):
+    rejected = set()
+
+    def reject_once(path):
+        if path == "index.php" and path not in rejected:
+            rejected.add(path)
+            return True
+        return False
+    ftp_server.reject_stor = reject_once
+
+    smart_deploy.FTPDeployer(engine_config).deploy({"added_modified": _files(local_dir), "deleted": []})
+
+    assert ftp_server.files["index.php"] == (local_dir / "index.php").read_bytes()
+    assert any("Upload ulang 1 file" in line for line in logs())
+
+
+def test_corrupted_upload_is_uploaded_again(ftp_server, engine_config, local_dir, logs):
+    ftp_server.features.append("XCRC")
+    ftp_server.corrupt["assets/file3.txt"] = "flip"
+
+    smart_deploy.FTPDeployer(engine_config).deploy({"added_modified": _files(local_dir), "deleted": []})
+
+    assert ftp_server.files["assets/file3.txt"] == (local_dir / "assets/file3.txt").read_bytes()
+    assert any("checksum CRC32 tidak cocok" in line for line in logs())
+
+
+@pytest.mark.parametrize("features, replies", [
+    ([], {"SIZE": "213 n/a"}),
+    (["XCRC"], {"XCRC": "250 Checksum unavailable"}),
+    (["XCRC"], {"XCRC": "250 1A2B3C"}),  # CRC tanpa leading zero tidak bisa dicocokkan dengan pasti
+    (["XMD5"], {"XMD5": "504 Not supported for this file"}),
+    ([], {"SIZE": "502 Command not implemented"}),
+])
+def test_unverifiable_files_are_reported(ftp_server, engine_config, local_dir, logs, features, replies):
+    ftp_server.features.extend(features)
+    ftp_server.replies.update(replies)
+    files = _files(local_dir)
+
+    smart_deploy.FTPDeployer(engine_config).deploy({"added_modified": files, "deleted": []})
+
+    lines = logs()
+    assert any(f"{len(files)} file tidak bisa diverifikasi" in line for line in lines)
+    assert not any("Verifikasi upload OK" in line for line in lines)